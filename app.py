@@ -2,10 +2,11 @@
 Databricks Workflows Launcher
 Main application entry point with navigation
 """
+import uuid
 import streamlit as st
-from databricks.sdk import WorkspaceClient
-from components.trigger_job import show_trigger_job_page
-from components.run_status import show_run_status_page
+from client import get_workspace_client
+from instrumentation import configure_logging
+from session_memory import get_session_registry
 
 st.set_page_config(
     page_title="Workflows Launcher", 
@@ -24,8 +25,10 @@ hide_default_nav = """
 """
 st.markdown(hide_default_nav, unsafe_allow_html=True)
 
-# Initialize WorkspaceClient
-w = WorkspaceClient()
+configure_logging()
+
+# Shared WorkspaceClient (created once per process, reused across reruns)
+w = get_workspace_client()
 
 st.header("Workflows", divider=True)
 
@@ -33,17 +36,42 @@ st.header("Workflows", divider=True)
 st.sidebar.empty()
 with st.sidebar:
     st.header("Navigation")
-    page = st.radio("Select Page", ["TRIGGER JOB", "RUN STATUS"], index=0)
+    page = st.radio("Select Page", ["TRIGGER JOB", "RUN STATUS", "PROVENANCE", "DIAGNOSTICS"], index=0)
     
     st.divider()
     
     if page == "TRIGGER JOB":
         st.caption("🚀 Trigger Databricks jobs with custom parameters")
-    else:
+    elif page == "RUN STATUS":
         st.caption("📊 Monitor job run history and status")
+    elif page == "PROVENANCE":
+        st.caption("🔎 Find runs by who triggered them or their parameters")
+    else:
+        st.caption("🩺 API latency, call counts and cache hit rates")
 
-# Route to appropriate page
-if page == "TRIGGER JOB":
-    show_trigger_job_page(w)
-elif page == "RUN STATUS":
-    show_run_status_page(w)
\ No newline at end of file
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex[:8]
+
+# Route to appropriate page; page modules (and pandas) are imported on first use
+try:
+    if page == "TRIGGER JOB":
+        from components.trigger_job import show_trigger_job_page
+        show_trigger_job_page(w)
+    elif page == "RUN STATUS":
+        from components.run_status import show_run_status_page
+        show_run_status_page(w)
+    elif page == "PROVENANCE":
+        from components.provenance import show_provenance_page
+        show_provenance_page(w)
+    elif page == "DIAGNOSTICS":
+        from components.diagnostics import show_diagnostics_page
+        show_diagnostics_page()
+finally:
+    # Record what this session holds (also when a page stops or reruns early)
+    dashboard = st.session_state.get("dashboard_runs")
+    get_session_registry().report(
+        st.session_state.session_id,
+        st.session_state.to_dict(),
+        page=page,
+        runs=st.session_state.get("runs_loaded", 0) + (len(dashboard) if dashboard is not None else 0),
+    )
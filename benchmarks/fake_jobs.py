@@ -0,0 +1,375 @@
+"""
+In-process stand-in for WorkspaceClient.jobs, used by the benchmarks.
+
+Generates a deterministic workspace of N jobs with mixed task types and
+realistic parameter shapes, each with M runs (a few still in flight, the
+rest terminal with a mix of results). Every API call, and every page of a
+paginated call, sleeps for the configured latency so page renders cost
+roughly what they would against a real workspace. Calls are counted per
+method.
+"""
+import random
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+from databricks.sdk.errors import InvalidParameterValue, NotFound
+from databricks.sdk.service import jobs as J
+
+# Default and largest page sizes of the real endpoints
+JOBS_PAGE_SIZE, MAX_JOBS_PAGE_SIZE = 20, 100
+RUNS_PAGE_SIZE, MAX_RUNS_PAGE_SIZE = 20, 25
+
+# Task run IDs are TASK_RUN_ID_BASE + 100 * job run ID + task index
+TASK_RUN_ID_BASE = 10**15
+# Milliseconds between two runs of a job, on average
+RUN_SPACING_MS = 3_600_000
+
+# Task types and how often they appear
+TASK_TYPES = (
+    ("notebook_task", 40),
+    ("spark_python_task", 15),
+    ("python_wheel_task", 15),
+    ("sql_task", 10),
+    ("spark_jar_task", 8),
+    ("spark_submit_task", 5),
+    ("dbt_task", 5),
+    ("pipeline_task", 2),
+)
+# Terminal results and how often they occur
+RESULTS = (("SUCCESS", 85), ("FAILED", 10), ("CANCELED", 3), ("TIMEDOUT", 2))
+ACTIVE_STATES = ("RUNNING", "PENDING", "QUEUED")
+FAILURE_CODES = ("RUN_EXECUTION_ERROR", "DRIVER_ERROR", "CLUSTER_ERROR", "LIBRARY_INSTALLATION_ERROR", "INTERNAL_ERROR")
+
+_TEAMS = ("ingest", "finance", "ml", "marketing", "platform", "risk")
+_WORDS = ("daily", "hourly", "orders", "customers", "events", "revenue", "features", "scoring", "export", "backfill")
+_USERS = tuple(f"{name}@example.com" for name in ("ana", "bo", "chen", "dara", "eli", "fatima", "gus"))
+
+
+def _weighted(rng: random.Random, table):
+    return rng.choices([v for v, _ in table], weights=[w for _, w in table])[0]
+
+
+def make_task(rng: random.Random, index: int, task_type: str) -> J.Task:
+    """
+    One task of the given type, with the parameter shape that type takes
+    """
+    key = f"{task_type.removesuffix('_task')}_{index}"
+    fields = {
+        "notebook_task": lambda: J.NotebookTask(
+            notebook_path=f"/Repos/etl/{key}", base_parameters={"date": "", "env": "prod"}),
+        "spark_python_task": lambda: J.SparkPythonTask(
+            python_file=f"/Workspace/etl/{key}.py", parameters=["--date", "", "--env", "prod"]),
+        "python_wheel_task": lambda: J.PythonWheelTask(
+            package_name="etl", entry_point=key, named_parameters={"date": "", "env": "prod"}),
+        "sql_task": lambda: J.SqlTask(
+            warehouse_id="abc123", query=J.SqlTaskQuery(query_id=f"q{index}"), parameters={"date": ""}),
+        "spark_jar_task": lambda: J.SparkJarTask(main_class_name=f"com.example.{key}", parameters=["--date"]),
+        "spark_submit_task": lambda: J.SparkSubmitTask(parameters=["--class", "com.example.Main", "app.jar"]),
+        "dbt_task": lambda: J.DbtTask(commands=["dbt deps", "dbt run"]),
+        "pipeline_task": lambda: J.PipelineTask(pipeline_id=f"pipeline-{index}"),
+    }
+    depends_on = [J.TaskDependency(task_key=f"dep_{index - 1}")] if index and rng.random() < 0.5 else None
+    return J.Task(task_key=key, depends_on=depends_on, **{task_type: fields[task_type]()})
+
+
+def make_job(rng: random.Random, job_id: int, created_time: int) -> J.Job:
+    """
+    One job with 1-8 tasks of mixed types; about half define job-level parameters
+    """
+    tasks = [make_task(rng, i, _weighted(rng, TASK_TYPES)) for i in range(rng.choice((1, 1, 1, 2, 3, 5, 8)))]
+    parameters = None
+    if rng.random() < 0.5:
+        parameters = [J.JobParameterDefinition(name="triggered_by", default="")]
+        parameters += [
+            J.JobParameterDefinition(name=name, default=default)
+            for name, default in rng.sample([("date", ""), ("env", "prod"), ("region", "emea"), ("full_refresh", "false")],
+                                            rng.randint(1, 4))
+        ]
+    team = rng.choice(_TEAMS)
+    name = "_".join(rng.sample(_WORDS, 2) + [team, str(job_id)])
+    return J.Job(
+        job_id=job_id,
+        created_time=created_time,
+        creator_user_name=rng.choice(_USERS),
+        settings=J.JobSettings(
+            name=name,
+            tags={"team": team, "tier": rng.choice(("gold", "silver", "bronze"))},
+            tasks=tasks,
+            parameters=parameters,
+            max_concurrent_runs=rng.choice((1, 1, 4)),
+        ),
+    )
+
+
+def _run_parameters(rng: random.Random, job: J.Job, day: int, user: str):
+    """
+    Parameters a run of the job was launched with: job_parameters when the
+    job defines them, otherwise overrides in the style of its first task
+    """
+    date = f"2026-{(day // 28) % 12 + 1:02d}-{day % 28 + 1:02d}"
+    if job.settings.parameters:
+        values = {p.name: p.default for p in job.settings.parameters}
+        values.update(triggered_by=user, date=date)
+        return {"job_parameters": [J.JobParameter(name=k, value=v, default="") for k, v in values.items()]}, None
+    task = job.settings.tasks[0]
+    if task.notebook_task:
+        overrides = J.RunParameters(notebook_params={"date": date, "env": "prod", "triggered_by": user})
+    elif task.python_wheel_task:
+        overrides = J.RunParameters(python_named_params={"date": date, "triggered_by": user})
+    elif task.spark_python_task:
+        overrides = J.RunParameters(python_params=["--date", date, f"--triggered_by={user}"])
+    elif task.spark_jar_task:
+        overrides = J.RunParameters(jar_params=["--date", date])
+    else:
+        overrides = J.RunParameters(sql_params={"date": date}) if task.sql_task and rng.random() < 0.5 else None
+    return {}, overrides
+
+
+def make_runs(rng: random.Random, job: J.Job, count: int, now_ms: int, first_run_id: int) -> list[J.BaseRun]:
+    """
+    `count` runs of a job, newest first; the newest may still be in flight
+    """
+    runs = []
+    start = now_ms - rng.randint(0, RUN_SPACING_MS // 4)
+    active = rng.choice((0, 0, 0, 1, 1, 2))
+    for k in range(count):
+        queue = rng.choice((0, 0, 0, 1_000, 15_000, 120_000))
+        user = rng.choice(_USERS)
+        params, overrides = _run_parameters(rng, job, k, user)
+        run = J.BaseRun(
+            run_id=first_run_id + k,
+            job_id=job.job_id,
+            run_name=job.settings.name,
+            run_type=J.RunType.JOB_RUN,
+            creator_user_name=user,
+            start_time=start,
+            queue_duration=queue,
+            overriding_parameters=overrides,
+            **params,
+        )
+        if k < active:
+            state = rng.choice(ACTIVE_STATES)
+            run.status = J.RunStatus(state=J.RunLifecycleStateV2State(state))
+            run.state = J.RunState(life_cycle_state=J.RunLifeCycleState(state))
+        else:
+            duration = int(rng.lognormvariate(12.5, 0.8))
+            result = _weighted(rng, RESULTS)
+            code = result if result in ("SUCCESS", "CANCELED") else rng.choice(FAILURE_CODES)
+            run.end_time = start + queue + duration
+            run.execution_duration = duration
+            run.run_duration = queue + duration
+            run.status = J.RunStatus(
+                state=J.RunLifecycleStateV2State.TERMINATED,
+                termination_details=J.TerminationDetails(
+                    code=J.TerminationCodeCode(code),
+                    message="" if result == "SUCCESS" else f"Task failed with {code}",
+                ),
+            )
+            run.state = J.RunState(
+                life_cycle_state=J.RunLifeCycleState.TERMINATED,
+                result_state=J.RunResultState(result),
+                state_message="" if result == "SUCCESS" else f"Task failed with {code}",
+            )
+        runs.append(run)
+        start -= rng.randint(RUN_SPACING_MS // 2, RUN_SPACING_MS * 3 // 2)
+    return runs
+
+
+def make_task_runs(run: J.BaseRun, tasks: list[J.Task]) -> list[J.RunTask]:
+    """
+    Task runs of a job run: in a failed run one task fails and the tasks
+    after it are skipped as upstream failures
+    """
+    result = run.state.result_state
+    failing = run.run_id % len(tasks) if result in (J.RunResultState.FAILED, J.RunResultState.TIMEDOUT) else None
+    task_runs = []
+    start = run.start_time + (run.queue_duration or 0)
+    share = (run.execution_duration or 0) // len(tasks)
+    for i, task in enumerate(tasks[:100]):
+        task_run = J.RunTask(
+            task_key=task.task_key,
+            run_id=TASK_RUN_ID_BASE + run.run_id * 100 + i,
+            start_time=start + i * share,
+            attempt_number=0,
+        )
+        if result is None:
+            task_run.state = J.RunState(life_cycle_state=run.state.life_cycle_state)
+            task_run.status = J.RunStatus(state=run.status.state)
+        else:
+            if failing is None:
+                task_result = result
+            else:
+                task_result = (J.RunResultState.SUCCESS if i < failing else
+                               result if i == failing else J.RunResultState.UPSTREAM_FAILED)
+            task_run.end_time = task_run.start_time + share
+            task_run.execution_duration = share
+            task_run.state = J.RunState(
+                life_cycle_state=J.RunLifeCycleState.TERMINATED,
+                result_state=task_result,
+                state_message=run.state.state_message if i == failing else "",
+            )
+        task_runs.append(task_run)
+    return task_runs
+
+
+class _Submitted:
+    """
+    What run_now returns; the real Wait object also exposes run_id
+    """
+
+    def __init__(self, run_id: int):
+        self.run_id = run_id
+
+
+class FakeJobsAPI:
+    """
+    Implements the subset of JobsAPI the app uses, over generated data
+    """
+
+    def __init__(self, jobs: int = 500, runs_per_job: int = 100, latency: float = 0.05, seed: int = 0):
+        self.latency = latency
+        self.runs_per_job = runs_per_job
+        self.seed = seed
+        # Runs end around now so time-windowed views see them; times are rounded for repeatable data
+        self.now_ms = int(time.time() // 3600 * 3600 * 1000)
+        rng = random.Random(seed)
+        self._jobs = {
+            job_id: make_job(rng, job_id, self.now_ms - rng.randint(1, 400) * 86_400_000)
+            for job_id in range(1001, 1001 + jobs)
+        }
+        self._runs: dict[int, list[J.BaseRun]] = {}
+        self._next_run_id = 10**9
+        self._lock = threading.Lock()
+        self.calls = Counter()
+
+    # --- Helpers ---
+    def _call(self, method: str):
+        with self._lock:
+            self.calls[method] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def job_ids(self) -> list[int]:
+        return list(self._jobs)
+
+    def runs_of(self, job_id: int) -> list[J.BaseRun]:
+        """
+        Runs of a job, newest first, generated on first access
+        """
+        with self._lock:
+            runs = self._runs.get(job_id)
+            if runs is None:
+                rng = random.Random(self.seed * 1_000_003 + job_id)
+                runs = make_runs(rng, self._jobs[job_id], self.runs_per_job, self.now_ms, job_id * 100_000)
+                self._runs[job_id] = runs
+            return runs
+
+    def _paginate(self, method: str, items, limit: int | None, default: int, maximum: int):
+        page = min(limit or default, maximum)
+        for i in range(0, len(items), page):
+            self._call(method)
+            yield from items[i:i + page]
+        if not items:
+            self._call(method)
+
+    # --- JobsAPI ---
+    def list(self, *, expand_tasks: bool | None = None, limit: int | None = None, name: str | None = None,
+             offset: int | None = None, page_token: str | None = None):
+        jobs = [j for j in self._jobs.values() if name is None or j.settings.name == name][offset or 0:]
+        items = [
+            J.BaseJob(
+                job_id=j.job_id,
+                created_time=j.created_time,
+                creator_user_name=j.creator_user_name,
+                settings=j.settings if expand_tasks else J.JobSettings(
+                    **{f: getattr(j.settings, f) for f in j.settings.__dataclass_fields__ if f != "tasks"}),
+            )
+            for j in jobs
+        ]
+        return self._paginate("list", items, limit, JOBS_PAGE_SIZE, MAX_JOBS_PAGE_SIZE)
+
+    def get(self, job_id: int, *, page_token: str | None = None) -> J.Job:
+        self._call("get")
+        if job_id not in self._jobs:
+            raise NotFound(f"Job {job_id} does not exist.")
+        return self._jobs[job_id]
+
+    def list_runs(self, *, active_only: bool | None = None, completed_only: bool | None = None,
+                  expand_tasks: bool | None = None, job_id: int | None = None, limit: int | None = None,
+                  offset: int | None = None, page_token: str | None = None, run_type=None,
+                  start_time_from: int | None = None, start_time_to: int | None = None):
+        if job_id is not None:
+            runs = self.runs_of(job_id) if job_id in self._jobs else []
+        else:
+            runs = sorted((r for j in self._jobs for r in self.runs_of(j)), key=lambda r: r.start_time, reverse=True)
+        items = [
+            r for r in runs
+            if (start_time_from is None or r.start_time >= start_time_from)
+            and (start_time_to is None or r.start_time <= start_time_to)
+            and not (active_only and r.end_time)
+            and not (completed_only and not r.end_time)
+            and (run_type is None or r.run_type == run_type)
+        ][offset or 0:]
+        return self._paginate("list_runs", items, limit, RUNS_PAGE_SIZE, MAX_RUNS_PAGE_SIZE)
+
+    def _find_run(self, run_id: int) -> J.BaseRun:
+        job_id = run_id // 100_000
+        for run in self.runs_of(job_id) if job_id in self._jobs else []:
+            if run.run_id == run_id:
+                return run
+        raise NotFound(f"Run {run_id} does not exist.")
+
+    def get_run(self, run_id: int, **kwargs) -> J.Run:
+        self._call("get_run")
+        run = self._find_run(run_id)
+        return J.Run(
+            **{f: getattr(run, f) for f in run.__dataclass_fields__ if f != "tasks"},
+            tasks=make_task_runs(run, self._jobs[run.job_id].settings.tasks),
+        )
+
+    def get_run_output(self, run_id: int) -> J.RunOutput:
+        self._call("get_run_output")
+        if run_id < TASK_RUN_ID_BASE:
+            raise InvalidParameterValue("Retrieving the output of runs with multiple tasks is not supported.")
+        run = self._find_run((run_id - TASK_RUN_ID_BASE) // 100)
+        task = make_task_runs(run, self._jobs[run.job_id].settings.tasks)[(run_id - TASK_RUN_ID_BASE) % 100]
+        if task.state.result_state in (J.RunResultState.FAILED, J.RunResultState.TIMEDOUT):
+            frames = "".join(f'  File "/Workspace/etl/{task.task_key}.py", line {10 * i + 3}, in step_{i}\n' for i in range(30))
+            return J.RunOutput(
+                error=task.state.state_message,
+                error_trace=f"Traceback (most recent call last):\n{frames}RuntimeError: {task.state.state_message}",
+            )
+        return J.RunOutput(notebook_output=J.NotebookOutput(result="ok"))
+
+    def run_now(self, job_id: int, **kwargs) -> _Submitted:
+        self._call("run_now")
+        if job_id not in self._jobs:
+            raise NotFound(f"Job {job_id} does not exist.")
+        with self._lock:
+            self._next_run_id += 1
+            return _Submitted(self._next_run_id)
+
+
+class _FakeConfig:
+    host = "https://benchmark.fake.databricks.test"
+
+
+class FakeWorkspaceClient:
+    """
+    Stands in for WorkspaceClient; only `jobs` and `config.host` are used by the app
+    """
+
+    def __init__(self, jobs: int = 500, runs_per_job: int = 100, latency: float = 0.05, seed: int = 0):
+        self.jobs = FakeJobsAPI(jobs=jobs, runs_per_job=runs_per_job, latency=latency, seed=seed)
+        self.config = _FakeConfig()
+
+
+@lru_cache(maxsize=None)
+def shared_workspace(jobs: int, runs_per_job: int, latency: float, seed: int = 0) -> FakeWorkspaceClient:
+    """
+    One fake workspace per configuration for the whole process, so Streamlit
+    reruns of a benchmarked page keep talking to the same workspace
+    """
+    return FakeWorkspaceClient(jobs=jobs, runs_per_job=runs_per_job, latency=latency, seed=seed)
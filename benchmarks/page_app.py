@@ -0,0 +1,24 @@
+"""
+Streamlit script rendering one app page against the fake workspace; driven
+by streamlit.testing's AppTest from benchmarks/run.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_jobs import shared_workspace  # noqa: E402
+
+w = shared_workspace(
+    int(os.environ["BENCH_JOBS"]),
+    int(os.environ["BENCH_RUNS_PER_JOB"]),
+    float(os.environ["BENCH_LATENCY_SECONDS"]),
+    int(os.environ.get("BENCH_SEED", "0")),
+)
+
+if os.environ["BENCH_PAGE"] == "trigger_job":
+    from components.trigger_job import show_trigger_job_page
+    show_trigger_job_page(w)
+else:
+    from components.run_status import show_run_status_page
+    show_run_status_page(w)
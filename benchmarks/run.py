@@ -0,0 +1,248 @@
+"""
+Offline benchmarks of the app against the fake Jobs API.
+
+    python -m benchmarks.run [--jobs 500] [--runs-per-job 100] [--latency-ms 50]
+                             [--only pages,normalize,param_modes]
+                             [--output results.json] [--compare baseline.json]
+
+Measures:
+  pages        first render and median rerender of the Trigger Job and Run
+               Status pages through Streamlit's testing harness, with the
+               number of Jobs API calls each made. Every page runs in a fresh
+               process with an empty run store and job catalog snapshot, so
+               the first render is a true cold start.
+  normalize    throughput of run normalization (extract_runs, runs_frame,
+               display_frame)
+  param_modes  throughput of parameter-mode detection over job task lists
+
+Results are written as JSON (by default to benchmarks/results/). With
+--compare, every timing is checked against an earlier results file and the
+command exits with status 1 if any got slower by more than --threshold.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fake_jobs import FakeWorkspaceClient, shared_workspace  # noqa: E402
+
+PAGE_APP = os.path.join(ROOT, "benchmarks", "page_app.py")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+PAGES = ("trigger_job", "run_status")
+SUITES = ("pages", "normalize", "param_modes")
+# Detections timed per pass of the param_modes benchmark
+PARAM_MODE_DETECTIONS = 100_000
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# --- Page renders ---
+def _page_worker(args) -> dict:
+    """
+    Render one page repeatedly in this process and return its timings
+    """
+    from streamlit.testing.v1 import AppTest
+
+    w = shared_workspace(args.jobs, args.runs_per_job, args.latency_ms / 1000, args.seed)
+    at = AppTest.from_file(PAGE_APP, default_timeout=600)
+
+    def render() -> tuple[float, int]:
+        before = sum(w.jobs.calls.values())
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{args.page_worker} page failed: {at.exception[0].message}")
+        return elapsed, sum(w.jobs.calls.values()) - before
+
+    first, first_calls = render()
+    renders = [render() for _ in range(args.renders)]
+    name = f"page.{args.page_worker}"
+    return {
+        f"{name}.first_render": {"seconds": first, "api_calls": first_calls},
+        f"{name}.rerender": {
+            "seconds": statistics.median(t for t, _ in renders),
+            "api_calls": sum(c for _, c in renders) / len(renders),
+        },
+    }
+
+
+def bench_pages(args) -> dict:
+    results = {}
+    for page in PAGES:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **os.environ,
+                "BENCH_PAGE": page,
+                "BENCH_JOBS": str(args.jobs),
+                "BENCH_RUNS_PER_JOB": str(args.runs_per_job),
+                "BENCH_LATENCY_SECONDS": str(args.latency_ms / 1000),
+                "BENCH_SEED": str(args.seed),
+                "RUN_STORE_PATH": os.path.join(tmp, "runs.sqlite3"),
+                "JOB_CATALOG_SNAPSHOT": os.path.join(tmp, "job_catalog.json"),
+            }
+            cmd = [
+                sys.executable, "-m", "benchmarks.run", "--page-worker", page,
+                "--jobs", str(args.jobs), "--runs-per-job", str(args.runs_per_job),
+                "--latency-ms", str(args.latency_ms), "--seed", str(args.seed), "--renders", str(args.renders),
+            ]
+            proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+            if proc.returncode:
+                raise RuntimeError(f"Benchmark of the {page} page failed:\n{proc.stderr}")
+            results.update(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return results
+
+
+# --- Run normalization ---
+def bench_normalize(args) -> dict:
+    from run_normalizer import display_frame, extract_runs, runs_frame
+
+    w = FakeWorkspaceClient(jobs=args.normalize_runs // args.runs_per_job + 1, runs_per_job=args.runs_per_job,
+                            latency=0, seed=args.seed)
+    runs = [run for job_id in w.jobs.job_ids() for run in w.jobs.runs_of(job_id)][:args.normalize_runs]
+    cols = extract_runs(runs)
+    df = runs_frame(cols)
+    results = {}
+    for name, fn in (
+        ("extract_runs", lambda: extract_runs(runs)),
+        ("runs_frame", lambda: runs_frame(cols)),
+        ("display_frame", lambda: display_frame(df)),
+    ):
+        seconds = _best_of(args.repeat, fn)
+        results[f"normalize.{name}"] = {"seconds": seconds, "runs": len(runs), "per_second": len(runs) / seconds}
+    return results
+
+
+# --- Parameter-mode detection ---
+def bench_param_modes(args) -> dict:
+    from utils import detect_param_modes
+
+    w = FakeWorkspaceClient(jobs=args.jobs, runs_per_job=0, latency=0, seed=args.seed)
+    task_lists = [w.jobs.get(job_id).settings.tasks for job_id in w.jobs.job_ids()]
+    passes = max(1, PARAM_MODE_DETECTIONS // len(task_lists))
+
+    def detect_all():
+        for _ in range(passes):
+            for tasks in task_lists:
+                detect_param_modes(tasks)
+
+    seconds = _best_of(args.repeat, detect_all)
+    detections = passes * len(task_lists)
+    return {"param_modes.detect": {"seconds": seconds, "jobs": detections, "per_second": detections / seconds}}
+
+
+# --- Reporting ---
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict, baseline: dict | None, threshold: float) -> list[str]:
+    """
+    Print a results table; return the names of benchmarks that regressed
+    """
+    regressions = []
+    print(f"{'benchmark':<36} {'seconds':>10} {'baseline':>10} {'change':>8}  extra")
+    for name, result in results.items():
+        extra = ", ".join(
+            f"{k}={v:,.0f}" if isinstance(v, (int, float)) else f"{k}={v}" for k, v in result.items() if k != "seconds"
+        )
+        line = f"{name:<36} {result['seconds']:>10.4f}"
+        previous = (baseline or {}).get(name)
+        if previous:
+            change = result["seconds"] / previous["seconds"] - 1 if previous["seconds"] else 0.0
+            flag = ""
+            if change > threshold:
+                regressions.append(name)
+                flag = "  REGRESSION"
+            line += f" {previous['seconds']:>10.4f} {change:>+8.1%}  {extra}{flag}"
+        else:
+            line += f" {'':>10} {'':>8}  {extra}"
+        print(line)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the app against a fake Jobs API")
+    parser.add_argument("--jobs", type=int, default=500, help="Jobs in the fake workspace")
+    parser.add_argument("--runs-per-job", type=int, default=100, help="Runs per job in the fake workspace")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulated latency of each API call/page")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated workspace")
+    parser.add_argument("--renders", type=int, default=5, help="Reruns timed per page after the first render")
+    parser.add_argument("--normalize-runs", type=int, default=50_000, help="Runs normalized per timing")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeats of each throughput timing (best is kept)")
+    parser.add_argument("--only", default=",".join(SUITES), help=f"Comma-separated suites to run: {', '.join(SUITES)}")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Slowdown counted as a regression (0.2 = 20%%)")
+    parser.add_argument("--page-worker", choices=PAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.page_worker:
+        print(json.dumps(_page_worker(args)))
+        return 0
+
+    suites = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"Unknown suites: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for suite in suites:
+        results.update({"pages": bench_pages, "normalize": bench_normalize, "param_modes": bench_param_modes}[suite](args))
+
+    commit = _git_commit()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    report = {
+        "meta": {
+            "created_at": now.isoformat(timespec="seconds"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {k: getattr(args, k) for k in (
+                "jobs", "runs_per_job", "latency_ms", "seed", "renders", "normalize_runs", "repeat")},
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{now:%Y%m%dT%H%M%SZ}-{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous["meta"]["config"] != report["meta"]["config"]:
+            print("Warning: baseline was recorded with a different configuration", file=sys.stderr)
+        baseline = previous["results"]
+    regressions = print_results(results, baseline, args.threshold)
+    print(f"\nResults written to {output}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Bulk run-now submission for backfills and parameter sweeps.
+
+A batch is a list of parameter rows (from a CSV upload or the cartesian
+product of a sweep definition) merged onto the job's base parameters. Runs
+are submitted concurrently under a rate limit, each with a deterministic
+idempotency token so a retried or resubmitted row never launches twice.
+"""
+import csv
+import hashlib
+import io
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import requests
+from databricks.sdk import WorkspaceClient
+from databricks.sdk.errors import DeadlineExceeded, InternalError, TemporarilyUnavailable, TooManyRequests
+from rate_limit import TokenBucket
+from run_params import MAX_REPORTED_ERRORS, params_to_rows, validate_rows
+from utils import LIST_PARAM_STYLES, MAP_PARAM_STYLES
+
+MAX_BULK_RUNS = int(os.environ.get("BULK_TRIGGER_MAX_RUNS", "1000"))
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE_PER_SECOND = 2.0
+MAX_ATTEMPTS = 3
+# Errors worth retrying; safe because every attempt reuses the idempotency token.
+# Dropped connections surface as requests' exceptions, which don't subclass the builtin ConnectionError.
+RETRYABLE_ERRORS = (
+    TooManyRequests,
+    TemporarilyUnavailable,
+    InternalError,
+    DeadlineExceeded,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    ConnectionError,
+)
+
+
+@dataclass
+class BulkResult:
+    """
+    Outcome of submitting one row of a batch
+    """
+    index: int
+    params: dict
+    run_id: int | None = None
+    error: str = ""
+    attempts: int = 0
+
+
+def parse_csv(text: str) -> list[dict[str, str]]:
+    """
+    Parse a CSV with a header row of parameter names into parameter rows
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames:
+        raise ValueError("CSV has no header row")
+    names = [n.strip() for n in reader.fieldnames]
+    if any(not n for n in names) or len(set(names)) != len(names):
+        raise ValueError("CSV header must contain unique, non-empty parameter names")
+    rows = []
+    for raw in reader:
+        values = list(raw.values())
+        rows.append({name: (value or "").strip() for name, value in zip(names, values)})
+    return rows
+
+
+def parse_sweep(text: str) -> dict[str, list[str]]:
+    """
+    Parse a sweep definition: either JSON ({"name": ["v1", "v2"]}) or one
+    `name=v1,v2,v3` line per parameter
+    """
+    text = text.strip()
+    if not text:
+        return {}
+    if text.startswith("{"):
+        spec = json.loads(text)
+        if not isinstance(spec, dict):
+            raise ValueError("Sweep JSON must be an object of parameter name to list of values")
+        return {str(k): [str(v) for v in (vals if isinstance(vals, list) else [vals])] for k, vals in spec.items()}
+    spec = {}
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        name, sep, values = line.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Line {line_no}: expected name=value1,value2,...")
+        spec[name.strip()] = [v.strip() for v in values.split(",") if v.strip()]
+    return spec
+
+
+def expand_sweep(spec: dict[str, list[str]]) -> list[dict[str, str]]:
+    """
+    Cartesian product of the sweep values, one parameter row per combination
+    """
+    if not spec or any(not values for values in spec.values()):
+        return []
+    names = list(spec)
+    size = 1
+    for values in spec.values():
+        size *= len(values)
+    if size > MAX_BULK_RUNS:
+        raise ValueError(f"Sweep expands to {size} runs; the limit is {MAX_BULK_RUNS}")
+    return [dict(zip(names, combo)) for combo in itertools.product(*spec.values())]
+
+
+def build_payload(param_style: str, base, row: dict[str, str], triggered_by: str) -> dict:
+    """
+    Merge one parameter row onto the base parameters and stamp triggered_by
+    """
+    if param_style in MAP_PARAM_STYLES:
+        params = {**(base or {}), **row, "triggered_by": triggered_by}
+    elif param_style in LIST_PARAM_STYLES:
+        overridden = {f"--{name}=" for name in row} | {"--triggered_by="}
+        params = [item for item in (base or []) if not any(item.startswith(p) for p in overridden)]
+        params += [f"--{name}={value}" for name, value in row.items()]
+        params.append(f"--triggered_by={triggered_by}")
+    else:
+        raise ValueError(f"Unsupported parameter style: {param_style}")
+    return {param_style: params}
+
+
+def validate_payloads(param_style: str, payloads: list[dict]) -> list[str]:
+    """
+    Check every merged row the way a single trigger is checked (names,
+    triggered_by, ASCII-only styles); returns the problems, by row
+    """
+    errors = []
+    for index, payload in enumerate(payloads, start=1):
+        _, row_errors = validate_rows(param_style, params_to_rows(param_style, payload[param_style]))
+        errors += [f"Row {index}: {e}" for e in row_errors]
+        if len(errors) > MAX_REPORTED_ERRORS:
+            return errors[:MAX_REPORTED_ERRORS] + ["... and more"]
+    return errors
+
+
+def idempotency_token(job_id: int, batch_label: str, payload: dict) -> str:
+    """
+    Deterministic token (the API allows at most 64 characters), so the same
+    row of the same batch always maps to the same run
+    """
+    key = json.dumps([job_id, batch_label, payload], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:64]
+
+
+def submit_batch(
+    w: WorkspaceClient,
+    job_id: int,
+    payloads: list[dict],
+    batch_label: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+    only: list[str] | None = None,
+):
+    """
+    Submit one run per payload, at most `concurrency` in flight and at most
+    `rate_per_second` started per second. Yields a BulkResult per row in
+    completion order.
+    """
+    if len(payloads) > MAX_BULK_RUNS:
+        raise ValueError(f"A batch can launch at most {MAX_BULK_RUNS} runs")
+    bucket = TokenBucket(rate_per_second, capacity=min(float(concurrency), max(1.0, rate_per_second)))
+    extra = {"only": only} if only else {}
+
+    def submit(index: int, payload: dict) -> BulkResult:
+        result = BulkResult(index=index, params=payload)
+        token = idempotency_token(job_id, batch_label, {**payload, **extra})
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            result.attempts = attempt
+            bucket.acquire()
+            try:
+                resp = w.jobs.run_now(job_id=job_id, idempotency_token=token, **payload, **extra)
+                result.run_id = resp.run_id
+                result.error = ""
+                return result
+            except RETRYABLE_ERRORS as e:
+                result.error = str(e)
+                if attempt < MAX_ATTEMPTS:
+                    time.sleep(min(2 ** attempt, 10))
+            except Exception as e:
+                result.error = str(e)
+                return result
+        return result
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bulk-trigger") as pool:
+        futures = [pool.submit(submit, i, payload) for i, payload in enumerate(payloads)]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,57 @@
+"""
+Process-wide WorkspaceClient factory.
+
+Streamlit re-executes app.py on every interaction; building a client there
+re-resolves auth and opens a fresh HTTP session each time. The client built
+here is created once per process and shared by all sessions and reruns, and
+all of its API calls go through the shared request layer (request_layer.py).
+"""
+import os
+import threading
+
+from databricks.sdk import WorkspaceClient
+from databricks.sdk.config import Config
+from instrumentation import InstrumentedClient
+from request_layer import BackoffClock, RequestLayer, install_request_layer
+
+# Connections kept alive to the workspace host. Page helpers fetch in
+# parallel (dashboard, bulk trigger, background refreshes), so the pool is
+# sized well above the SDK default of 20 to avoid blocking on checkout.
+HTTP_POOL_SIZE = int(os.environ.get("DATABRICKS_HTTP_POOL_SIZE", "32"))
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("DATABRICKS_HTTP_TIMEOUT_SECONDS", "60"))
+
+_client = None
+_layer = None
+_client_lock = threading.Lock()
+
+
+def get_workspace_client() -> WorkspaceClient:
+    """
+    Return the shared WorkspaceClient, creating it on first use.
+    Its Jobs API calls are timed (see instrumentation.py).
+    """
+    global _client, _layer
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # The SDK sleeps on this clock between retries; throttle backoffs are shared
+                clock = BackoffClock()
+                config = Config(
+                    # The SDK maps these two onto the adapter's pool count and
+                    # pool size; set both so neither caps concurrency
+                    max_connection_pools=HTTP_POOL_SIZE,
+                    max_connections_per_pool=HTTP_POOL_SIZE,
+                    http_timeout_seconds=HTTP_TIMEOUT_SECONDS,
+                    clock=clock,
+                )
+                client = WorkspaceClient(config=config)
+                _layer = install_request_layer(client, clock)
+                _client = InstrumentedClient(client)
+    return _client
+
+
+def get_request_layer() -> RequestLayer | None:
+    """
+    Return the request layer of the shared client (None until it is created)
+    """
+    return _layer
@@ -0,0 +1,121 @@
+"""
+Bulk trigger panel for the Trigger Job page
+"""
+import uuid
+import streamlit as st
+from databricks.sdk import WorkspaceClient
+from bulk_trigger import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_RATE_PER_SECOND,
+    MAX_BULK_RUNS,
+    build_payload,
+    expand_sweep,
+    parse_csv,
+    parse_sweep,
+    submit_batch,
+    validate_payloads,
+)
+from utils import extract_triggered_by, validate_triggered_by
+
+PREVIEW_ROWS = 20
+
+def show_bulk_trigger(w: WorkspaceClient, job_id: int, param_style: str, base_params, only: list[str]):
+    """
+    Launch one run per parameter row; the parameters edited above are the
+    base that every row is merged onto
+    """
+    st.caption(
+        f"Each row is merged onto the {param_style} above and launched as its own run "
+        f"(at most {MAX_BULK_RUNS} per batch)."
+    )
+
+    source = st.radio("Rows from", ["Parameter sweep", "CSV upload"], horizontal=True, key="bulk_source")
+    try:
+        if source == "CSV upload":
+            upload = st.file_uploader("CSV with one column per parameter", type=["csv"], key="bulk_csv")
+            rows = parse_csv(upload.getvalue().decode("utf-8")) if upload else []
+        else:
+            sweep = st.text_area(
+                "Sweep definition",
+                key="bulk_sweep",
+                placeholder="date=2026-09-28,2026-09-29,2026-09-30\nregion=emea,amer",
+                help='One name=value1,value2 line per parameter, or JSON like {"date": ["2026-09-30"]}. '
+                     "Every combination of values becomes one run.",
+            )
+            rows = expand_sweep(parse_sweep(sweep))
+    except (ValueError, UnicodeDecodeError) as e:
+        st.error(f"❌ {e}")
+        return
+
+    if not rows:
+        st.info("Define at least one parameter row.")
+        return
+    if len(rows) > MAX_BULK_RUNS:
+        st.error(f"❌ {len(rows)} rows; a batch can launch at most {MAX_BULK_RUNS} runs.")
+        return
+    st.dataframe(rows[:PREVIEW_ROWS], use_container_width=True)
+    if len(rows) > PREVIEW_ROWS:
+        st.caption(f"Showing {PREVIEW_ROWS} of {len(rows)} rows.")
+
+    # triggered_by is checked once and stamped on every run of the batch
+    triggered_by = st.text_input(
+        "Triggered by (applies to every run)",
+        value=extract_triggered_by(param_style, base_params),
+        placeholder="user@example.com",
+        key="bulk_triggered_by",
+    )
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        concurrency = st.number_input("Max concurrent submissions", 1, 16, DEFAULT_CONCURRENCY, key="bulk_concurrency")
+    with c2:
+        rate = st.number_input("Max runs started per second", 0.1, 20.0, DEFAULT_RATE_PER_SECOND, step=0.5, key="bulk_rate")
+    with c3:
+        if "bulk_batch_label" not in st.session_state:
+            st.session_state.bulk_batch_label = uuid.uuid4().hex[:12]
+        batch_label = st.text_input(
+            "Batch label",
+            key="bulk_batch_label",
+            help="Rows already launched under this label are not launched again. Change it to relaunch on purpose.",
+        )
+
+    if not st.button(f"Launch {len(rows)} runs", type="primary", key="bulk_launch"):
+        return
+
+    error = validate_triggered_by(triggered_by)
+    if error:
+        st.error(f"❌ {error}")
+        return
+
+    payloads = [build_payload(param_style, base_params, row, triggered_by.strip()) for row in rows]
+    # Every merged row gets the checks of a single trigger before anything is launched
+    errors = validate_payloads(param_style, payloads)
+    if errors:
+        st.error("❌ Invalid parameters:\n\n" + "\n".join(f"- {e}" for e in errors))
+        return
+    results = [None] * len(rows)
+    progress = st.progress(0.0, text="Submitting runs...")
+    table = st.empty()
+    launched = failed = 0
+    for done, result in enumerate(
+        submit_batch(w, job_id, payloads, batch_label, concurrency=int(concurrency), rate_per_second=float(rate), only=only),
+        start=1,
+    ):
+        if result.run_id:
+            launched += 1
+        else:
+            failed += 1
+        results[result.index] = {
+            "Row": result.index + 1,
+            **rows[result.index],
+            "Run ID": result.run_id,
+            "Error": result.error,
+            "Attempts": result.attempts,
+        }
+        progress.progress(done / len(rows), text=f"{done} of {len(rows)} submitted ({failed} failed)")
+        table.dataframe([r for r in results if r], use_container_width=True, hide_index=True)
+    progress.empty()
+
+    if failed:
+        st.warning(f"Launched {launched} runs; {failed} failed. Resubmitting with the same batch label does not launch the successful rows again.")
+    else:
+        st.success(f"Launched {launched} runs ✅")
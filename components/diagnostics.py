@@ -0,0 +1,109 @@
+"""
+Diagnostics page: API latency, call counts and cache effectiveness
+"""
+import datetime
+import time
+import streamlit as st
+from client import get_request_layer
+from instrumentation import metrics
+from request_layer import API_BURST, API_RATE_PER_SECOND
+from session_memory import SESSION_MAX_RUNS, SESSION_REPORT_TTL_SECONDS, get_session_registry
+
+def show_diagnostics_page():
+    """
+    Display the diagnostics page
+    """
+    st.subheader("Diagnostics")
+    started = datetime.datetime.fromtimestamp(metrics.started_at).strftime("%Y-%m-%d %H:%M:%S")
+    st.write(f"Process-wide metrics for all sessions since {started}.")
+
+    st.markdown("### Calls")
+    st.caption(
+        "Jobs API calls (`jobs.*`), page renders (`page.*`) and instrumented helpers. "
+        "Percentiles are estimated from latency histograms. Paginated calls report items, "
+        "single-object calls report response bytes."
+    )
+    st.caption(
+        f"All sessions share one request layer: identical GETs in flight are merged (`api.singleflight`), "
+        f"requests are limited to {API_RATE_PER_SECOND:g}/s with bursts of {API_BURST:g} (`api.rate_limit_wait`), "
+        f"and while the API throttles (`api.backoff`) recent responses are served stale (`api.stale_while_throttled`)."
+    )
+    layer = get_request_layer()
+    throttled = layer.throttled_for() if layer is not None else 0
+    if throttled:
+        st.warning(f"The Jobs API is throttling requests; backing off for {throttled:.0f}s more.")
+    timings = metrics.timings()
+    if timings:
+        st.dataframe(
+            timings,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                col: st.column_config.NumberColumn(format="%.1f")
+                for col in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "total_s")
+            },
+        )
+    else:
+        st.info("No calls recorded yet.")
+
+    st.markdown("### Caches")
+    caches = metrics.caches()
+    if caches:
+        st.dataframe(
+            caches,
+            use_container_width=True,
+            hide_index=True,
+            column_config={"hit_ratio": st.column_config.ProgressColumn(min_value=0.0, max_value=1.0, format="%.2f")},
+        )
+    else:
+        st.info("No cache lookups recorded yet.")
+
+    st.markdown("### Sessions")
+    st.caption(
+        f"Approximate session_state memory of every session active in the last "
+        f"{SESSION_REPORT_TTL_SECONDS // 60} minutes, as of its last render. "
+        f"Run tables are capped at {SESSION_MAX_RUNS} runs per session."
+    )
+    now = time.time()
+    current = st.session_state.get("session_id")
+    sessions = [{
+        "session": r.session_id + (" (this session)" if r.session_id == current else ""),
+        "page": r.page,
+        "idle_s": now - r.updated_at,
+        "memory_kb": r.bytes / 1024,
+        "runs": r.runs,
+        "largest_entries": ", ".join(f"{key} ({size / 1024:.0f} KB)" for key, size in r.largest),
+    } for r in get_session_registry().reports()]
+    if sessions:
+        st.dataframe(
+            sessions,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "idle_s": st.column_config.NumberColumn(format="%.0f"),
+                "memory_kb": st.column_config.NumberColumn(format="%.1f"),
+            },
+        )
+        st.caption(f"{len(sessions)} sessions, {sum(s['memory_kb'] for s in sessions) / 1024:.1f} MB in total.")
+    else:
+        st.info("No sessions reported yet.")
+
+    st.markdown("### Export")
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        st.download_button(
+            "Download Prometheus metrics",
+            data=metrics.prometheus_text(),
+            file_name="trigger_job_app_metrics.prom",
+            mime="text/plain",
+        )
+    with c2:
+        if st.button("Write snapshot to logs"):
+            if metrics.log_snapshot():
+                st.success("Snapshot logged to 'trigger_job_app.metrics'.")
+            else:
+                st.warning("The 'trigger_job_app.metrics' logger is not enabled for INFO; nothing was logged.")
+    with c3:
+        if st.button("Reset metrics"):
+            metrics.reset()
+            st.rerun()
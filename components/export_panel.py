@@ -0,0 +1,88 @@
+"""
+Run history export panel for the Run Status page
+"""
+import datetime
+import os
+import time
+import streamlit as st
+from databricks.sdk import WorkspaceClient
+from job_catalog import JobRecord
+from run_export import EXPORT_MAX_BYTES, FORMATS, cleanup_exports, export_runs, new_export_path
+from run_filters import day_range_ms
+
+def _read_file(path: str):
+    # Deferred download: the file is only read when the button is clicked, not on every rerun
+    def read() -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+    return read
+
+def _discard_export():
+    previous = st.session_state.pop("run_export", None)
+    if previous and os.path.exists(previous["path"]):
+        os.remove(previous["path"])
+
+def show_run_export(w: WorkspaceClient, job: JobRecord):
+    """
+    Export the run history of a job, paged from the API and written chunk by
+    chunk to a CSV or Parquet file, then offer it for download
+    """
+    c1, c2 = st.columns([1, 2])
+    with c1:
+        fmt = st.radio("Format", list(FORMATS), horizontal=True, key="export_format")
+    with c2:
+        everything = st.checkbox("All history", value=False, key="export_all")
+        today = datetime.date.today()
+        window = st.date_input(
+            "Start date range",
+            value=(today - datetime.timedelta(days=30), today),
+            max_value=today,
+            disabled=everything,
+            key="export_window",
+        )
+
+    start_time_from = start_time_to = None
+    if not everything:
+        if not isinstance(window, (tuple, list)) or len(window) != 2:
+            st.info("Pick a start and an end date.")
+            return
+        start_time_from, start_time_to = day_range_ms(*window)
+
+    if st.button("Prepare export", key="export_prepare"):
+        _discard_export()
+        cleanup_exports()
+        path = new_export_path(job.job_id, fmt)
+        # Progress is measured by how far back in time the export has reached
+        newest = start_time_to or int(time.time() * 1000)
+        oldest = start_time_from or job.created_time or 0
+        span = max(newest - oldest, 1)
+        progress = st.progress(0.0, text="Exporting runs...")
+        written = 0
+        try:
+            for written, reached in export_runs(w, job.job_id, path, fmt, start_time_from, start_time_to):
+                done = min(max((newest - reached) / span, 0.0), 1.0) if reached and oldest else 0.0
+                progress.progress(done, text=f"Exported {written} runs")
+        except Exception as e:
+            progress.empty()
+            os.remove(path)
+            st.error(f"Error exporting runs: {e}")
+            return
+        progress.empty()
+        st.session_state.run_export = {"path": path, "job_id": job.job_id, "format": fmt, "runs": written}
+
+    export = st.session_state.get("run_export")
+    if not export or export["job_id"] != job.job_id or not os.path.exists(export["path"]):
+        return
+    ext, mime = FORMATS[export["format"]]
+    size_mb = os.path.getsize(export["path"]) / (1024 * 1024)
+    note = f"{export['runs']} runs, {size_mb:.2f} MB."
+    if os.path.getsize(export["path"]) >= EXPORT_MAX_BYTES:
+        note += " Stopped at the export size limit; narrow the date range for older runs."
+    st.caption(note)
+    st.download_button(
+        f"Download {export['format']}",
+        data=_read_file(export["path"]),
+        file_name=f"runs_{job.job_id}.{ext}",
+        mime=mime,
+        key="export_download",
+    )
@@ -0,0 +1,59 @@
+"""
+Searchable job selector shared by the pages
+"""
+import streamlit as st
+from job_catalog import JobCatalog
+from utils import job_label
+
+MAX_RESULTS = 50
+# Top matches handed to `prefetch` as the jobs the user is likely to pick next
+PREFETCH_MATCHES = 5
+
+def select_job(catalog: JobCatalog, key: str, prefetch=None):
+    """
+    Render a search box plus a selectbox holding only the top matches.
+    Returns the selected job record, or None when nothing matches.
+    `prefetch`, if given, is called with the IDs of the top matches.
+    """
+    query = st.text_input(
+        "Search jobs",
+        key=f"{key}_query",
+        placeholder="Name, job ID, tag or creator",
+    )
+    matches = catalog.search(query, limit=MAX_RESULTS)
+    if not matches:
+        st.info("No jobs match your search.")
+        return None
+    if prefetch is not None:
+        prefetch([r.job_id for r in matches[:PREFETCH_MATCHES]])
+
+    total = len(catalog.jobs())
+    if total > len(matches):
+        st.caption(f"Showing top {len(matches)} of {total} jobs. Refine the search to narrow the list.")
+
+    return st.selectbox(
+        "Job",
+        options=matches,
+        format_func=job_label,
+        key=key,
+    )
+
+def select_jobs(catalog: JobCatalog, key: str, max_jobs: int):
+    """
+    Pick up to `max_jobs` jobs, either all jobs carrying a tag or the top
+    matches of a search. Returns the selected job records.
+    """
+    select_by = st.radio("Select jobs by", ["Tag", "Search"], horizontal=True, key=f"{key}_select_by")
+
+    if select_by == "Tag":
+        tag_options = sorted({f"{k}={v}" if v else k for job in catalog.jobs() for k, v in job.tags})
+        if not tag_options:
+            st.info("No tagged jobs found.")
+            return []
+        tag = st.selectbox("Tag", options=tag_options, key=f"{key}_tag")
+        tag_key, _, value = tag.partition("=")
+        return [job for job in catalog.jobs() if (tag_key, value) in job.tags][:max_jobs]
+
+    query = st.text_input("Search jobs", key=f"{key}_query", placeholder="Name, job ID, tag or creator")
+    limit = st.slider("Max jobs", min_value=1, max_value=max_jobs, value=min(20, max_jobs), key=f"{key}_max_jobs")
+    return catalog.search(query, limit=limit) if query else []
@@ -0,0 +1,64 @@
+"""
+Bulk parameter editor for the Trigger Job page: one grid plus a JSON / YAML
+paste box, so the widget count stays the same however many parameters a
+job has
+"""
+import streamlit as st
+from run_params import dump_params, parse_params_text, validate_rows
+from utils import MAP_PARAM_STYLES
+
+def draw_bulk_editor(title: str, param_style: str, initial_rows: list[tuple[str, str]], key: str):
+    """
+    Edit a whole parameter set at once and validate it in one pass.
+    Returns the parameters in run-now shape.
+    """
+    # pandas is imported here, not at module level, to keep it off the trigger page's cold path
+    import pandas as pd
+
+    st.write(title)
+    is_map = param_style in MAP_PARAM_STYLES
+    # Rows the grid starts from; replaced (and the grid reset) when a pasted set is applied
+    state = st.session_state.setdefault(f"{key}_bulk", {"rows": list(initial_rows), "version": 0})
+
+    columns = ["Name", "Value"] if is_map else ["Value"]
+    frame = pd.DataFrame(
+        [(name, value) if is_map else (value,) for name, value in state["rows"]],
+        columns=columns,
+        dtype="string",
+    )
+    edited = st.data_editor(
+        frame,
+        key=f"{key}_grid_{state['version']}",
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={col: st.column_config.TextColumn(col) for col in columns},
+    )
+    values = edited.fillna("")
+    rows = list(zip(values["Name"], values["Value"])) if is_map else [("", v) for v in values["Value"]]
+
+    params, errors = validate_rows(param_style, rows)
+    st.caption(f"{len(params)} parameters.")
+    if errors:
+        st.warning("\n".join(f"- {e}" for e in errors))
+
+    with st.expander("Paste as JSON / YAML"):
+        fmt = st.radio("Format", ["JSON", "YAML"], horizontal=True, key=f"{key}_paste_format")
+        st.code(dump_params(param_style, rows, fmt), language=fmt.lower())
+        text = st.text_area(
+            "Replace all parameters with",
+            key=f"{key}_paste_{state['version']}",
+            height=200,
+            placeholder='{"triggered_by": "user@example.com", "date": "2026-10-01"}' if is_map
+            else '["--triggered_by=user@example.com", "--date=2026-10-01"]',
+        )
+        if st.button("Replace parameters", key=f"{key}_paste_apply", disabled=not text.strip()):
+            try:
+                state["rows"] = parse_params_text(param_style, text)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                state["version"] += 1
+                st.rerun()
+
+    return params
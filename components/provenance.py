@@ -0,0 +1,121 @@
+"""
+Provenance page: find runs of any job by who triggered them or the
+parameters they ran with, from the parameter index of the local run store
+"""
+import datetime
+import time
+import streamlit as st
+from databricks.sdk import WorkspaceClient
+from components.job_picker import select_jobs
+from components.run_status import show_run_details
+from instrumentation import timed
+from job_catalog import JobCatalog, get_job_catalog
+from param_index import parse_query
+from run_filters import day_range_ms
+from run_normalizer import display_frame, runs_frame
+from run_stats import prepare_window
+from run_store import get_run_store
+from session_memory import SESSION_MAX_RUNS
+from utils import job_label
+
+MAX_INDEX_JOBS = 50
+DEFAULT_RESULTS = 100
+
+@timed("page.provenance")
+def show_provenance_page(w: WorkspaceClient):
+    """
+    Display the provenance search page
+    """
+    st.subheader("Run Provenance")
+    st.write("Find runs across all jobs by who triggered them or by the parameters they ran with.")
+
+    catalog = get_job_catalog(w)
+    store = get_run_store()
+
+    query = st.text_input(
+        "Parameters",
+        key="provenance_search",
+        placeholder="triggered_by=alice@example.com partition=2026-09-30",
+    )
+    st.caption(
+        "Space-separated `name=value` terms that must all match; a bare value matches any parameter "
+        "and a trailing `*` matches a prefix (`triggered_by=alice*`). Values ignore case."
+    )
+    c1, c2 = st.columns([2, 1])
+    with c1:
+        by_date = st.checkbox("Filter by start date", key="provenance_by_date")
+        today = datetime.date.today()
+        window = st.date_input("Start date range", value=(today - datetime.timedelta(days=30), today),
+                               max_value=today, disabled=not by_date, key="provenance_window")
+    with c2:
+        limit = st.number_input("Max runs", min_value=1, max_value=SESSION_MAX_RUNS, value=DEFAULT_RESULTS,
+                                key="provenance_limit")
+
+    # Before the results, so runs indexed on this rerun are already searched
+    with st.expander("Index more run history"):
+        show_index_history(w, catalog)
+    runs, jobs, oldest = store.coverage()
+    if runs:
+        oldest_day = datetime.datetime.fromtimestamp(oldest / 1000).strftime("%Y-%m-%d")
+        st.caption(f"Searching {runs} runs of {jobs} jobs synced to the local run store, back to {oldest_day}. "
+                   "Index more history above to search further.")
+    else:
+        st.caption("No runs are stored yet. Open jobs on the Run Status page, or index their history above.")
+
+    if query.strip():
+        try:
+            terms = parse_query(query)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            terms = []
+        if terms:
+            since = until = None
+            if by_date and isinstance(window, (tuple, list)) and len(window) == 2:
+                since, until = day_range_ms(*window)
+            show_matching_runs(w, catalog, store.search_params(terms, since, until, limit=int(limit)))
+
+def show_matching_runs(w: WorkspaceClient, catalog: JobCatalog, result):
+    """
+    Table of the runs matching a search, with the job each belongs to
+    """
+    cols, total = result
+    st.markdown("### Matching runs")
+    if not total:
+        st.info("No stored runs match these parameters.")
+        return
+    shown = len(cols["run_id"])
+    st.caption(f"{total} matching runs" + (f"; showing the newest {shown}." if shown < total else "."))
+    df = display_frame(runs_frame(cols))
+    names = {}
+    for job_id in set(cols["job_id"]):
+        job = catalog.get(job_id)
+        names[job_id] = job_label(job) if job is not None else f"Job {job_id}"
+    df.insert(0, "Job", [names[job_id] for job_id in cols["job_id"]])
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    show_run_details(w, df)
+
+def show_index_history(w: WorkspaceClient, catalog: JobCatalog):
+    """
+    Sync and backfill the stored history of some jobs back to a number of
+    days, so their runs become searchable
+    """
+    jobs = select_jobs(catalog, key="provenance_jobs", max_jobs=MAX_INDEX_JOBS)
+    days = st.number_input("Last N days", min_value=1, max_value=365, value=30, key="provenance_index_days")
+    if not st.button("Index history", key="provenance_index", disabled=not jobs):
+        return
+
+    since = int((time.time() - int(days) * 86400) * 1000)
+    store = get_run_store()
+    failures = []
+    progress = st.progress(0.0, text="Indexing run history...")
+    for done, job in enumerate(jobs, start=1):
+        try:
+            # Only runs not yet in the store are fetched; writing them updates the index
+            prepare_window(w, store, job.job_id, since=since)
+        except Exception as e:
+            failures.append(f"{job_label(job)}: {e}")
+        progress.progress(done / len(jobs), text=f"Indexed {done} of {len(jobs)} jobs")
+    progress.empty()
+    st.success(f"Indexed the last {int(days)} days of {len(jobs) - len(failures)} jobs.")
+    if failures:
+        st.warning("Could not load runs for:\n\n" + "\n".join(f"- {f}" for f in failures))
@@ -0,0 +1,125 @@
+"""
+Per-job reliability and duration statistics for the Run Status page
+"""
+import datetime
+import time
+import streamlit as st
+from databricks.sdk import WorkspaceClient
+from components.job_picker import select_jobs
+from job_catalog import JobCatalog
+from run_stats import (BACKFILL_BUDGET_RUNS, MAX_STATS_RUNS, WINDOW_CAPPED, WINDOW_PARTIAL, RunStats, job_stats,
+                       prepare_window)
+from run_store import RUNS_PAGE_SIZE, get_run_store
+from utils import job_label
+
+MAX_STATS_JOBS = 20
+RATE_COLUMNS = ("Success rate", "Failure rate", "Canceled rate")
+SECONDS_COLUMNS = ("p50 duration (s)", "p95 duration (s)", "p99 duration (s)", "Mean queue (s)", "p95 queue (s)")
+
+def show_reliability_stats(w: WorkspaceClient, catalog: JobCatalog):
+    """
+    Display success/failure rates, duration and queue percentiles and
+    failure codes per job over a window of days or runs
+    """
+    st.markdown("### Select jobs")
+    jobs = select_jobs(catalog, key="stats", max_jobs=MAX_STATS_JOBS)
+    if not jobs:
+        st.info("No jobs selected.")
+        return
+
+    c1, c2 = st.columns([1, 2])
+    with c1:
+        window = st.radio("Window", ["Days", "Runs"], horizontal=True, key="stats_window")
+    with c2:
+        if window == "Days":
+            size = st.number_input("Last N days", min_value=1, max_value=365, value=7, key="stats_days")
+        else:
+            size = st.number_input("Last N runs per job", min_value=10, max_value=MAX_STATS_RUNS, value=1000,
+                                   step=100, key="stats_runs")
+    compute = st.button("Compute statistics", type="primary", key="stats_compute")
+    # Set by "Load more history": compute again, backfilling the next part of the window
+    compute = st.session_state.pop("stats_load_more", False) or compute
+
+    if not compute:
+        # Keep the last result visible across unrelated reruns
+        if st.session_state.get("stats_result") is not None:
+            show_stats_result(*st.session_state.stats_result)
+        return
+
+    since = int((time.time() - int(size) * 86400) * 1000) if window == "Days" else None
+    max_runs = int(size) if window == "Runs" else None
+    # Each job gets its share of the backfill budget, so a compute stays a few pages per job
+    budget = max(RUNS_PAGE_SIZE, BACKFILL_BUDGET_RUNS // len(jobs))
+    store = get_run_store()
+    per_job, truncated, partial, failures = {}, [], [], []
+    progress = st.progress(0.0, text="Loading run history...")
+    for done, job in enumerate(jobs, start=1):
+        try:
+            # Only runs not yet in the local store are fetched; aggregation streams from the store
+            coverage = prepare_window(w, store, job.job_id, since=since, max_runs=max_runs, budget=budget)
+            if coverage == WINDOW_CAPPED:
+                truncated.append(job_label(job))
+            elif coverage == WINDOW_PARTIAL:
+                partial.append(job_label(job))
+            per_job[job_label(job)] = job_stats(store, job.job_id, since=since, max_runs=max_runs)
+        except Exception as e:
+            failures.append(f"{job_label(job)}: {e}")
+        progress.progress(done / len(jobs), text=f"Aggregated {done} of {len(jobs)} jobs")
+    progress.empty()
+
+    st.session_state.stats_result = (per_job, truncated, partial)
+    show_stats_result(per_job, truncated, partial)
+    if failures:
+        st.warning("Could not load runs for:\n\n" + "\n".join(f"- {f}" for f in failures))
+
+def show_stats_result(per_job: dict[str, RunStats], truncated: list[str], partial: list[str]):
+    """
+    Statistics tables with notes on jobs whose window is not fully loaded
+    """
+    show_stats_tables(per_job)
+    if truncated:
+        st.caption(f"Only the newest {MAX_STATS_RUNS} runs were used for: {', '.join(truncated)}.")
+    if partial:
+        st.caption(f"Older history is not loaded yet for: {', '.join(partial)}. "
+                   "Statistics cover the runs loaded so far.")
+        st.button("Load more history", key="stats_more", on_click=st.session_state.update,
+                  kwargs={"stats_load_more": True})
+
+def show_stats_tables(per_job: dict[str, RunStats]):
+    """
+    Summary table (one row per job plus all jobs merged) and failure-code breakdown
+    """
+    if not any(stats.runs for stats in per_job.values()):
+        st.info("No runs in this window.")
+        return
+
+    total = RunStats()
+    for stats in per_job.values():
+        total.merge(stats)
+    rows = [{"Job": name, **stats.summary()} for name, stats in per_job.items()]
+    if len(per_job) > 1:
+        rows.append({"Job": "All selected jobs", **total.summary()})
+
+    st.markdown("### Reliability")
+    if total.oldest_start:
+        since = datetime.datetime.fromtimestamp(total.oldest_start / 1000).strftime("%Y-%m-%d %H:%M")
+        st.caption(f"{total.runs} runs since {since}. Rates are over finished runs; durations and queue times in seconds.")
+    column_config = {col: st.column_config.NumberColumn(format="percent") for col in RATE_COLUMNS}
+    column_config.update({col: st.column_config.NumberColumn(format="%.0f") for col in SECONDS_COLUMNS})
+    st.dataframe(rows, use_container_width=True, hide_index=True, column_config=column_config)
+
+    st.markdown("### Failure codes")
+    breakdown = [
+        {"Job": name, "Failure code": code, "Runs": n, "Share of failures": n / stats.failed}
+        for name, stats in per_job.items()
+        for code, n in stats.failure_codes.most_common()
+    ]
+    if not breakdown:
+        st.info("No failed runs in this window.")
+        return
+    st.dataframe(
+        sorted(breakdown, key=lambda r: -r["Runs"]),
+        use_container_width=True,
+        hide_index=True,
+        column_config={"Share of failures": st.column_config.NumberColumn(format="percent")},
+    )
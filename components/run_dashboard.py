@@ -0,0 +1,74 @@
+"""
+Multi-job run dashboard for the Run Status page
+"""
+import streamlit as st
+import pandas as pd
+from databricks.sdk import WorkspaceClient
+from components.job_picker import select_jobs
+from job_catalog import JobCatalog
+from run_fetch import fetch_runs_concurrently
+from run_normalizer import compact_frame, display_frame, runs_frame
+from session_memory import SESSION_MAX_RUNS
+
+MAX_DASHBOARD_JOBS = 50
+
+def dashboard_table(runs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Format the kept runs (typed frame with a job column) for display
+    """
+    df = display_frame(runs)
+    df.insert(0, "Job", runs["job"].astype("string"))
+    return df
+
+def show_run_dashboard(w: WorkspaceClient, catalog: JobCatalog):
+    """
+    Display the latest runs of many jobs at once
+    """
+    st.markdown("### Select jobs")
+    jobs = select_jobs(catalog, key="dashboard", max_jobs=MAX_DASHBOARD_JOBS)
+
+    if not jobs:
+        st.info("No jobs selected.")
+        return
+    st.caption(f"{len(jobs)} jobs selected (at most {MAX_DASHBOARD_JOBS}).")
+
+    runs_per_job = st.number_input("Runs per job", min_value=1, max_value=25, value=3, key="dashboard_runs_per_job")
+    load = st.button("Load dashboard", type="primary", key="dashboard_load")
+
+    table = st.empty()
+    if not load:
+        # Keep the last result visible across unrelated reruns
+        if st.session_state.get("dashboard_runs") is not None:
+            table.dataframe(dashboard_table(st.session_state.dashboard_runs), use_container_width=True, hide_index=True)
+        return
+
+    names = {job.job_id: job.name for job in jobs}
+    failures = []
+    runs = None
+    evicted = 0
+    progress = st.progress(0.0, text="Fetching run history...")
+    for done, result in enumerate(fetch_runs_concurrently(w, list(names), limit=int(runs_per_job)), start=1):
+        if result.error:
+            failures.append(f"{names[result.job_id]} (ID {result.job_id}): {result.error}")
+        if result.count:
+            frame = compact_frame(runs_frame(result.runs))
+            frame["job"] = pd.Categorical([names[result.job_id]] * len(frame), categories=sorted(set(names.values())))
+            runs = frame if runs is None else pd.concat([runs, frame], ignore_index=True)
+            # Status categories differ per job; re-encode so the kept frame stays compact
+            runs["status"] = runs["status"].astype("category")
+            runs = runs.sort_values("start_time", ascending=False, na_position="first", ignore_index=True)
+            # Keep at most SESSION_MAX_RUNS rows; the oldest runs are evicted
+            if len(runs) > SESSION_MAX_RUNS:
+                evicted += len(runs) - SESSION_MAX_RUNS
+                runs = runs.head(SESSION_MAX_RUNS)
+            table.dataframe(dashboard_table(runs), use_container_width=True, hide_index=True)
+        progress.progress(done / len(names), text=f"Fetched {done} of {len(names)} jobs")
+    progress.empty()
+
+    st.session_state.dashboard_runs = runs
+    if runs is None:
+        table.info("No runs found for the selected jobs.")
+    elif evicted:
+        st.caption(f"Showing the newest {SESSION_MAX_RUNS} runs; {evicted} older runs were dropped.")
+    if failures:
+        st.warning("Could not load runs for:\n\n" + "\n".join(f"- {f}" for f in failures))
@@ -1,12 +1,129 @@
 """
 Run Status page functionality
 """
-import streamlit as st
-import pandas as pd
 import datetime
+import time
+import streamlit as st
 from databricks.sdk import WorkspaceClient
-from utils import job_label, get_string_value
+from components.export_panel import show_run_export
+from components.job_picker import select_job
+from components.reliability import show_reliability_stats
+from components.run_dashboard import show_run_dashboard
+from instrumentation import timed
+from job_catalog import get_job_catalog
+from live_poller import get_run_poller
+from run_details import get_run_details_cache
+from run_filters import OUTCOMES, RUN_TYPES, RunFilter, day_range_ms, get_filtered_runs_cache
+from run_normalizer import display_frame, runs_frame
+from run_store import RUNS_PAGE_SIZE, get_run_store
+from session_memory import SESSION_MAX_RUNS
+
+RUNS_PER_PAGE = 5
+# Live view: fragment tick, cadence for discovering new runs, and row highlight
+LIVE_REFRESH_SECONDS = 2
+LIVE_DISCOVERY_SECONDS = 60
+HIGHLIGHT_SECONDS = 10
+HIGHLIGHT_STYLE = "background-color: rgba(255, 193, 7, 0.25)"
+
+def show_run_details(w: WorkspaceClient, df):
+    """
+    One expander per run of the table; task runs, outputs and error traces
+    are only loaded while an expander is open
+    """
+    st.markdown("#### Run details")
+    cache = get_run_details_cache()
+    for run_id, start, status in zip(df["Run ID"], df["Start time"], df["Status"]):
+        expander = st.expander(f"Run {run_id} · {status} · {start}", key=f"run_detail_{run_id}", on_change="rerun")
+        if not expander.open:
+            continue
+        with expander:
+            try:
+                detail = cache.get(w, int(run_id))
+            except Exception as e:
+                st.error(f"Error fetching run details: {e}")
+                continue
+            if detail.run_page_url:
+                st.markdown(f"[Open run in Databricks]({detail.run_page_url})")
+            if not detail.tasks:
+                st.info("No task runs.")
+                continue
+            st.dataframe(
+                [{
+                    "Task": t.task_key,
+                    "Task run ID": t.run_id,
+                    "Status": t.status,
+                    "Error code": t.error_code,
+                    "Duration": f"{t.duration_s}s" if t.duration_s is not None else "",
+                    "Attempt": t.attempt,
+                } for t in detail.tasks],
+                use_container_width=True,
+                hide_index=True,
+            )
+            for task in detail.tasks:
+                if not (task.error or task.error_trace or task.output):
+                    continue
+                st.markdown(f"**{task.task_key}**")
+                if task.error:
+                    st.error(task.error)
+                if task.error_trace:
+                    st.code(task.error_trace, language="text")
+                elif task.output:
+                    st.code(task.output, language="text")
 
+def select_run_filter() -> RunFilter:
+    """
+    Filter widgets for the run history of one job
+    """
+    c1, c2, c3 = st.columns([2, 1, 2])
+    with c1:
+        outcomes = st.multiselect("Outcome", OUTCOMES, key="filter_outcomes")
+    with c2:
+        run_type = st.selectbox("Run type", ["Any"] + list(RUN_TYPES), key="filter_run_type")
+    with c3:
+        by_date = st.checkbox("Filter by start date", key="filter_by_date")
+        today = datetime.date.today()
+        window = st.date_input("Start date range", value=(today, today), max_value=today, disabled=not by_date,
+                               key="filter_window")
+    start_time_from = start_time_to = None
+    if by_date and isinstance(window, (tuple, list)) and len(window) == 2:
+        start_time_from, start_time_to = day_range_ms(*window)
+    return RunFilter(
+        outcomes=tuple(o for o in OUTCOMES if o in outcomes),
+        start_time_from=start_time_from,
+        start_time_to=start_time_to,
+        run_type="" if run_type == "Any" else run_type,
+    )
+
+def show_filtered_runs(w: WorkspaceClient, job_id: int, run_filter: RunFilter):
+    """
+    Runs matching a filter, fetched from the API with every filter it supports
+    """
+    c1, c2 = st.columns([1, 3])
+    with c1:
+        limit = st.number_input("Max runs", min_value=1, max_value=SESSION_MAX_RUNS, value=RUNS_PAGE_SIZE,
+                                key="filter_limit")
+    with c2:
+        refresh = st.button("Refresh", key="filter_refresh")
+    try:
+        result = get_filtered_runs_cache().get(w, job_id, run_filter, int(limit), force=refresh)
+    except Exception as e:
+        st.error(f"Error fetching job runs: {e}")
+        return
+    
+    st.markdown("### Run History")
+    matched = len(result.cols["run_id"])
+    note = f"{matched} matching runs; {result.scanned} runs read from the API."
+    if not result.complete and matched < limit:
+        note += " Stopped at the scan limit; narrow the date range to look further back."
+    st.caption(note)
+    if not matched:
+        st.info("No runs match these filters.")
+        return
+    df = display_frame(runs_frame(result.cols))
+    st.dataframe(df, use_container_width=True)
+    show_run_details(w, df)
+
+@timed("page.run_status")
 def show_run_status_page(w: WorkspaceClient):
     """
     Display the run status page
@@ -14,191 +131,157 @@ def show_run_status_page(w: WorkspaceClient):
     st.subheader("Job Run Status")
     st.write("View and monitor job run history and status.")
     
-    # Job selector for status page
-    @st.cache_data(ttl=60)
-    def list_all_jobs():
-        return list(w.jobs.list(expand_tasks=False))
+    # Job selector for status page (shared process-wide catalog)
+    catalog = get_job_catalog(w)
+    try:
+        jobs = catalog.jobs()
+    except Exception as e:
+        st.error(f"Error listing jobs: {e}")
+        st.stop()
+    if not jobs:
+        st.info("No jobs found.")
+        st.stop()
     
-    all_jobs = list_all_jobs()
+    view = st.radio("View", ["Single job", "Dashboard", "Statistics"], horizontal=True, key="status_view_mode")
+    if view == "Dashboard":
+        show_run_dashboard(w, catalog)
+        return
+    if view == "Statistics":
+        show_reliability_stats(w, catalog)
+        return
     
     st.markdown("### Select a job to view run history")
-    if not all_jobs:
-        st.info("No jobs found.")
+    selected_job = select_job(catalog, key="status_job_selector")
+    if selected_job is None:
         st.stop()
     
-    selected_job = st.selectbox(
-        "Job",
-        options=all_jobs,
-        format_func=job_label,
-        key="status_job_selector"
-    )
-    
     # Initialize session state for pagination
+    if "runs_loaded" not in st.session_state:
+        st.session_state.runs_loaded = RUNS_PER_PAGE
     if "runs_offset" not in st.session_state:
+        # Newest runs evicted from the table once it reached SESSION_MAX_RUNS
         st.session_state.runs_offset = 0
-    if "all_runs" not in st.session_state:
-        st.session_state.all_runs = []
     if "selected_job_id" not in st.session_state:
         st.session_state.selected_job_id = None
     
     # Reset when job changes
     if st.session_state.selected_job_id != selected_job.job_id:
+        st.session_state.runs_loaded = RUNS_PER_PAGE
         st.session_state.runs_offset = 0
-        st.session_state.all_runs = []
         st.session_state.selected_job_id = selected_job.job_id
     
-    # Fetch job runs with pagination
-    @st.cache_data(ttl=30)  # Shorter cache for more up-to-date status
-    def get_job_runs_batch(job_id: int, limit: int = 5, offset: int = 0):
-        try:
-            # Get runs for the specific job with pagination
-            runs = list(w.jobs.list_runs(job_id=job_id, limit=limit, offset=offset))
-            return runs
-        except Exception as e:
-            st.error(f"Error fetching job runs: {e}")
-            return []
+    with st.expander("Filter runs"):
+        run_filter = select_run_filter()
+    if run_filter.active:
+        # Filtered queries go to the API directly; the local store only holds unfiltered history
+        show_filtered_runs(w, selected_job.job_id, run_filter)
+        with st.expander("Export run history"):
+            show_run_export(w, selected_job)
+        return
+    
+    # Pull only runs newer than what the shared local store already holds
+    store = get_run_store()
+    try:
+        store.sync(w, selected_job.job_id)
+    except Exception as e:
+        st.error(f"Error fetching job runs: {e}")
     
-    # Load initial batch or when load more is clicked
-    if st.session_state.runs_offset == 0 or len(st.session_state.all_runs) == 0:
-        initial_runs = get_job_runs_batch(selected_job.job_id, limit=5, offset=0)
-        st.session_state.all_runs = initial_runs
-        st.session_state.runs_offset = 5
+    live = st.toggle(
+        "Live updates",
+        key="status_live",
+        help="Poll runs that are still in flight and refresh only the run table.",
+    )
+    if "live_changes" not in st.session_state:
+        st.session_state.live_changes = {}
     
-    if not st.session_state.all_runs:
-        st.info("No runs found for this job.")
-    else:
+    # Only this fragment reruns on the live timer, not the whole page
+    @st.fragment(run_every=LIVE_REFRESH_SECONDS if live else None)
+    def show_run_history():
+        if live:
+            poller = get_run_poller()
+            try:
+                # New runs are picked up at a slow cadence; active runs are polled on their own schedule
+                store.sync(w, selected_job.job_id, min_interval=LIVE_DISCOVERY_SECONDS)
+                changed = poller.poll(w, store, store.active_run_ids(selected_job.job_id))
+            except Exception as e:
+                st.error(f"Error refreshing runs: {e}")
+                changed = {}
+            now = time.time()
+            # Only changes recent enough to highlight are kept
+            st.session_state.live_changes = {
+                run_id: at for run_id, at in st.session_state.live_changes.items() if now - at < HIGHLIGHT_SECONDS
+            }
+            st.session_state.live_changes.update({run_id: now for run_id in changed})
+        
+        offset = st.session_state.runs_offset
+        runs = store.query(selected_job.job_id, limit=st.session_state.runs_loaded, offset=offset)
+        if not runs["run_id"]:
+            st.info("No runs found for this job.")
+            return
+        
         st.markdown("### Run History")
+        if offset:
+            st.caption(
+                f"Showing runs {offset + 1}-{offset + len(runs['run_id'])}; the {offset} newest were dropped "
+                f"(at most {SESSION_MAX_RUNS} runs are shown at once)."
+            )
         
-        # Prepare data for table
-        run_data = []
-        for run in st.session_state.all_runs:
-            # Extract run parameters - try multiple locations
-            run_params = "None"
-            params = []
-            
-            # First try job_parameters (API structure: array of objects with name/value/default)
-            if hasattr(run, 'job_parameters') and run.job_parameters:
-                if isinstance(run.job_parameters, list):
-                    for param in run.job_parameters:
-                        if isinstance(param, dict):
-                            # Handle API structure: {"name": "table", "value": "customers", "default": "users"}
-                            if 'name' in param and 'value' in param:
-                                params.append(f"{param['name']}: {param['value']}")
-                            else:
-                                # Handle other dict formats
-                                for k, v in param.items():
-                                    params.append(f"{k}: {v}")
-                        else:
-                            params.append(str(param))
-                elif isinstance(run.job_parameters, dict):
-                    # Handle dict format
-                    for k, v in run.job_parameters.items():
-                        params.append(f"{k}: {v}")
-                else:
-                    params.append(str(run.job_parameters))
-            
-            # Fallback to overriding_parameters if no job_parameters found
-            elif hasattr(run, 'overriding_parameters') and run.overriding_parameters:
-                if hasattr(run.overriding_parameters, 'job_parameters') and run.overriding_parameters.job_parameters:
-                    for k, v in run.overriding_parameters.job_parameters.items():
-                        params.append(f"{k}: {v}")
-                if hasattr(run.overriding_parameters, 'notebook_params') and run.overriding_parameters.notebook_params:
-                    for k, v in run.overriding_parameters.notebook_params.items():
-                        params.append(f"{k}: {v}")
-                if hasattr(run.overriding_parameters, 'python_named_params') and run.overriding_parameters.python_named_params:
-                    for k, v in run.overriding_parameters.python_named_params.items():
-                        params.append(f"{k}: {v}")
-                if hasattr(run.overriding_parameters, 'python_params') and run.overriding_parameters.python_params:
-                    for param in run.overriding_parameters.python_params:
-                        params.append(str(param))
-            
-            run_params = ", ".join(params) if params else "None"
-            
-            # Format duration
-            duration = ""
-            if hasattr(run, 'execution_duration') and run.execution_duration:
-                duration = f"{run.execution_duration // 1000}s"
-            elif hasattr(run, 'start_time') and hasattr(run, 'end_time') and run.start_time and run.end_time:
-                duration_ms = run.end_time - run.start_time
-                duration = f"{duration_ms // 1000}s"
-            
-            # Format start time
-            start_time = ""
-            if hasattr(run, 'start_time') and run.start_time:
-                start_time = datetime.datetime.fromtimestamp(run.start_time / 1000).strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Get status from API response structure
-            status = "Unknown"
-            error_code = ""
-            
-            # First try run.status.state (main status field)
-            if hasattr(run, 'status') and run.status:
-                if hasattr(run.status, 'state') and run.status.state:
-                    status = get_string_value(run.status.state)
-                    
-                    # For TERMINATING or TERMINATED, get termination details
-                    if status in ["TERMINATING", "TERMINATED"]:
-                        if hasattr(run.status, 'termination_details') and run.status.termination_details:
-                            if hasattr(run.status.termination_details, 'code') and run.status.termination_details.code:
-                                termination_code = get_string_value(run.status.termination_details.code)
-                                # Use termination code as status for terminated runs
-                                if termination_code in ["SUCCESS", "FAILED", "CANCELED", "TIMEOUT"]:
-                                    status = termination_code
-                                    # Only show error code if it's actually an error (not SUCCESS)
-                                    if termination_code != "SUCCESS":
-                                        error_code = termination_code
-                                else:
-                                    # Unknown termination codes go to error code
-                                    error_code = termination_code
-                            elif hasattr(run.status.termination_details, 'message') and run.status.termination_details.message:
-                                error_code = get_string_value(run.status.termination_details.message)
-            
-            # Fallback to run.state.life_cycle_state if status not available  
-            if status == "Unknown" and hasattr(run, 'state') and run.state:
-                if hasattr(run.state, 'life_cycle_state') and run.state.life_cycle_state:
-                    status = get_string_value(run.state.life_cycle_state)
-                    
-                    # For TERMINATED state, check result_state for more detailed status
-                    if status == "TERMINATED" and hasattr(run.state, 'result_state') and run.state.result_state:
-                        result_state = get_string_value(run.state.result_state)
-                        # Use result_state for terminated runs (SUCCESS, FAILED, etc.)
-                        if result_state in ["SUCCESS", "FAILED", "CANCELED", "TIMEOUT"]:
-                            status = result_state
-                            # Only show error code if it's actually an error (not SUCCESS)
-                            if result_state != "SUCCESS":
-                                error_code = result_state
-                
-                # Get state message as error code if no other error code found and run failed
-                if not error_code and status not in ["SUCCESS", "RUNNING", "PENDING"] and hasattr(run.state, 'state_message') and run.state.state_message:
-                    error_code = get_string_value(run.state.state_message)
-            
-            run_data.append({
-                "Start time": start_time,
-                "Run ID": getattr(run, 'run_id', 'N/A'),
-                "Launched": "Manually",  # Most runs will be manual
-                "Duration": duration,
-                "Status": status,
-                "Error code": error_code,
-                "Run parameters": run_params
-            })
+        # Normalize all loaded runs in one columnar pass and display
+        df = display_frame(runs_frame(runs))
+        recent = {
+            run_id for run_id, at in st.session_state.live_changes.items()
+            if time.time() - at < HIGHLIGHT_SECONDS
+        }
+        if recent:
+            # Highlight rows whose status just changed
+            st.dataframe(
+                df.style.apply(
+                    lambda row: [HIGHLIGHT_STYLE if row["Run ID"] in recent else ""] * len(row),
+                    axis=1,
+                ),
+                use_container_width=True,
+            )
+        else:
+            st.dataframe(df, use_container_width=True)
         
-        # Display as dataframe
-        df = pd.DataFrame(run_data)
-        st.dataframe(df, use_container_width=True)
+        show_run_details(w, df)
         
+        if live:
+            active = store.active_run_ids(selected_job.job_id)
+            next_poll = get_run_poller().next_poll_in(active)
+            if active and next_poll is not None:
+                st.caption(f"{len(active)} active run(s); next status check in {next_poll:.0f}s.")
+            else:
+                st.caption("No active runs; watching for new ones.")
+    
+    show_run_history()
+    
+    if store.count(selected_job.job_id):
         # Load More button
         col1, col2, col3 = st.columns([1, 1, 1])
         with col2:
             if st.button("Load More Runs", key="load_more_runs"):
-                # Load next batch
-                more_runs = get_job_runs_batch(
-                    selected_job.job_id, 
-                    limit=5, 
-                    offset=st.session_state.runs_offset
-                )
-                if more_runs:
-                    st.session_state.all_runs.extend(more_runs)
-                    st.session_state.runs_offset += 5
+                # Page locally; only go to the API once the store runs out
+                shown = st.session_state.runs_offset + st.session_state.runs_loaded
+                wanted = shown + RUNS_PER_PAGE
+                if store.count(selected_job.job_id) < wanted and not store.exhausted(selected_job.job_id):
+                    try:
+                        store.backfill(w, selected_job.job_id, RUNS_PAGE_SIZE)
+                    except Exception as e:
+                        st.error(f"Error fetching job runs: {e}")
+                if store.count(selected_job.job_id) > shown:
+                    # Past the cap the window slides: the newest runs are evicted from the table
+                    st.session_state.runs_loaded = min(wanted, SESSION_MAX_RUNS)
+                    st.session_state.runs_offset = wanted - st.session_state.runs_loaded
                     st.rerun()
                 else:
                     st.info("No more runs to load.")
+        if st.session_state.runs_offset:
+            with col3:
+                if st.button("Back to newest runs", key="newest_runs"):
+                    st.session_state.runs_loaded = RUNS_PER_PAGE
+                    st.session_state.runs_offset = 0
+                    st.rerun()
+    
+    with st.expander("Export run history"):
+        show_run_export(w, selected_job)
@@ -3,8 +3,19 @@ Trigger Job page functionality
 """
 import streamlit as st
 from databricks.sdk import WorkspaceClient
-from utils import job_label
-
+from components.bulk_panel import show_bulk_trigger
+from components.job_picker import select_job
+from components.param_grid import draw_bulk_editor
+from instrumentation import timed
+from job_catalog import JobRecord, get_job_catalog
+from job_details import get_job_details_cache
+from run_params import BULK_EDITOR_THRESHOLD, params_to_rows, validate_rows
+from utils import MAP_PARAM_STYLES
+
+# Recently used jobs per session whose details are kept prefetched
+RECENT_JOBS = 5
+
+@timed("page.trigger_job")
 def show_trigger_job_page(w: WorkspaceClient):
     """
     Display the trigger job page
@@ -15,56 +26,41 @@ def show_trigger_job_page(w: WorkspaceClient):
         "Requires appropriate job permissions (for example, CAN MANAGE RUN)."
     )
 
-    # --- Fetch jobs ---
-    @st.cache_data(ttl=60)
-    def list_jobs():
-        # SDK list supports expand_tasks, pagination helpers.
-        return list(w.jobs.list(expand_tasks=True))
-
-    all_jobs = list_jobs()
-    jobs_for_display = all_jobs
+    # --- Fetch jobs (shared process-wide catalog, refreshed in the background) ---
+    catalog = get_job_catalog(w)
 
     # --- Job selector ---
     st.markdown("### Select a job")
-    if not jobs_for_display:
+    try:
+        jobs = catalog.jobs()
+    except Exception as e:
+        st.error(f"Error listing jobs: {e}")
+        st.stop()
+    if not jobs:
         st.info("No jobs found.")
         st.stop()
 
-    selected = st.selectbox(
-        "Job",
-        options=jobs_for_display,
-        format_func=job_label,
-    )
+    # Full job details are only prefetched in the background; the page renders from catalog metadata
+    details = get_job_details_cache(w)
+    selected = select_job(catalog, key="trigger_job_selector", prefetch=details.prefetch)
+    if selected is None:
+        st.stop()
 
-    # --- Load base parameters for the job (if any) and detect task types ---
-    @st.cache_data(ttl=60)
-    def get_job_details(job_id: int):
-        return w.jobs.get(job_id=job_id)
-
-    job_details = get_job_details(selected.job_id)
-
-    # Collect job-level parameters (Jobs 2.1 'job_parameters') and per-task parameter style hints
-    base_job_params = dict(getattr(job_details.settings, "job_parameters", {}) or {})
-
-    # Determine allowed param flavors based on tasks in job
-    task_param_modes = set()
-    for t in job_details.settings.tasks or []:
-        if hasattr(t, 'notebook_task') and getattr(t, 'notebook_task') is not None:
-            task_param_modes.add("notebook_params")
-        if hasattr(t, 'python_task') and getattr(t, 'python_task') is not None:
-            # python_task supports python_params (list) or python_named_params (map) at run-now time
-            task_param_modes.add("python_params")
-            task_param_modes.add("python_named_params")
-        if hasattr(t, 'spark_jar_task') and getattr(t, 'spark_jar_task') is not None:
-            task_param_modes.add("jar_params")
-        if hasattr(t, 'spark_submit_task') and getattr(t, 'spark_submit_task') is not None:
-            task_param_modes.add("spark_submit_params")
-        if hasattr(t, 'sql_task') and getattr(t, 'sql_task') is not None:
-            task_param_modes.add("sql_params")
-        if hasattr(t, 'python_wheel_task') and getattr(t, 'python_wheel_task') is not None:
-            task_param_modes.add("python_named_params")
-        if hasattr(t, 'dbt_task') and getattr(t, 'dbt_task') is not None:
-            task_param_modes.add("dbt_commands")
+    recent = st.session_state.setdefault("trigger_recent_jobs", [])
+    if selected.job_id in recent:
+        recent.remove(selected.job_id)
+    recent.insert(0, selected.job_id)
+    del recent[RECENT_JOBS:]
+    details.prefetch(recent)
+
+    # --- Job parameters and task types: fresh details if already fetched, else the listing metadata ---
+    # A job with more tasks than the listing returns has to wait for its details once
+    job_details = details.get(selected.job_id) if selected.tasks_truncated else details.peek(selected.job_id)
+    job_meta = JobRecord.from_job(job_details) if job_details is not None else selected
+
+    # Collect job-level parameter defaults and allowed param flavors based on tasks in job
+    base_job_params = dict(job_meta.default_params)
+    task_param_modes = job_meta.param_modes
 
     st.markdown("### Parameters")
     st.caption(
@@ -126,34 +122,52 @@ def show_trigger_job_page(w: WorkspaceClient):
             st.session_state[f"{title}_items"].append("")
         return [x for x in st.session_state[f"{title}_items"] if x]
 
-    payload = {}
     if param_style == "job_parameters":
         # Preload with base job parameters and add empty triggered_by parameter
+        title = "Job parameters (map)"
         initial = dict(base_job_params)
         initial.setdefault("triggered_by", "")
-        edited = draw_map_editor("Job parameters (map)", initial)
-        payload["job_parameters"] = edited
-
-    elif param_style in ("notebook_params", "python_named_params", "sql_params"):
-        initial = {}
-        initial["triggered_by"] = ""
-        edited = draw_map_editor(f"{param_style} (map)", initial)
-        payload[param_style] = edited
-
-    elif param_style in ("python_params", "jar_params", "spark_submit_params", "dbt_commands"):
+    elif param_style in MAP_PARAM_STYLES:
+        title = f"{param_style} (map)"
+        initial = {"triggered_by": ""}
+    else:
         # Add empty triggered_by parameter as string
+        title = f"{param_style} (list)"
         initial = ["--triggered_by="]
-        edited = draw_list_editor(f"{param_style} (list)", initial)
-        payload[param_style] = edited
+
+    # Large parameter sets default to the bulk editor, whose widget count does not grow with them
+    bulk_editor = st.toggle(
+        "Bulk editor",
+        value=len(initial) >= BULK_EDITOR_THRESHOLD,
+        key=f"{param_style}_{selected.job_id}_bulk_editor",
+        help="Edit all parameters in one grid, or paste them as JSON / YAML.",
+    )
+    if bulk_editor:
+        edited = draw_bulk_editor(title, param_style, params_to_rows(param_style, initial),
+                                  key=f"{param_style}_{selected.job_id}")
+    elif param_style in MAP_PARAM_STYLES:
+        edited = draw_map_editor(title, initial)
+    else:
+        edited = draw_list_editor(title, initial)
+    payload = {param_style: edited}
 
     # Optional: restrict to specific tasks inside a multi-task job
-    task_keys = [t.task_key for t in (job_details.settings.tasks or []) if t.task_key]
+    task_keys = list(job_meta.task_keys)
     subset = st.multiselect("Run only selected task keys (optional)", task_keys)
     if subset:
-        payload["tasks"] = subset  # Jobs 2.1 supports 'tasks' to run subset by keys
+        payload["only"] = subset  # run-now accepts 'only' to run a subset of task keys
 
     # --- Trigger button ---
     st.markdown("### Trigger")
+    bulk = st.toggle(
+        "Bulk mode",
+        key="trigger_bulk_mode",
+        help="Launch many runs of this job from a CSV upload or a parameter sweep.",
+    )
+    if bulk:
+        show_bulk_trigger(w, selected.job_id, param_style, payload.get(param_style), subset)
+        return
+
     col_t1, col_t2 = st.columns([1, 3])
     with col_t1:
         run_now = st.button("Trigger job", type="primary")
@@ -161,35 +175,16 @@ def show_trigger_job_page(w: WorkspaceClient):
         st.caption("Runs immediately via Jobs run-now API.")
 
     if run_now:
-        # Validate required triggered_by parameter
-        triggered_by_value = None
-        
-        # Extract triggered_by value based on parameter style
-        if param_style == "job_parameters" and "job_parameters" in payload:
-            triggered_by_value = payload["job_parameters"].get("triggered_by", "")
-        elif param_style in ("notebook_params", "python_named_params", "sql_params") and param_style in payload:
-            triggered_by_value = payload[param_style].get("triggered_by", "")
-        elif param_style in ("python_params", "jar_params", "spark_submit_params", "dbt_commands") and param_style in payload:
-            # Look for --triggered_by=email in list parameters
-            for param in payload[param_style]:
-                if param.startswith("--triggered_by="):
-                    triggered_by_value = param.split("=", 1)[1] if "=" in param else ""
-                    break
-        
-        # Validate email is provided
-        if not triggered_by_value or not triggered_by_value.strip():
-            st.error("❌ Please fill in the 'triggered_by' parameter with a valid email address")
+        # Validate the whole parameter set in one pass: triggered_by, ASCII-only styles
+        _, errors = validate_rows(param_style, params_to_rows(param_style, payload[param_style]))
+        if len(errors) == 1:
+            st.error(f"❌ {errors[0]}")
             st.stop()
-        
-        # Basic email validation
-        if "@" not in triggered_by_value or "." not in triggered_by_value.split("@")[-1]:
-            st.error("❌ Please provide a valid email address in the 'triggered_by' parameter")
+        if errors:
+            st.error("❌ Invalid parameters:\n\n" + "\n".join(f"- {e}" for e in errors))
             st.stop()
         
         try:
-            # Validate ASCII for specific param types per API notes (e.g., python_params & spark_submit_params)
-            # Rely on API to enforce; keep example simple.
-
             resp = w.jobs.run_now(
                 job_id=selected.job_id,
                 **payload
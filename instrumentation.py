@@ -0,0 +1,311 @@
+"""
+Latency, call-count, cache and payload instrumentation.
+
+Every Jobs API call made through the shared client and every instrumented
+helper records into one process-wide registry, which the Diagnostics page
+renders and which can be exported as Prometheus text or structured logs.
+"""
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("trigger_job_app.metrics")
+# Level of the metrics logger; DEBUG logs every call
+METRICS_LOG_LEVEL = os.environ.get("METRICS_LOG_LEVEL", "INFO").upper()
+
+# Histogram bucket upper bounds in seconds (Prometheus-style, cumulative on export)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _Timing:
+    __slots__ = ("count", "errors", "total", "max", "buckets", "payload_bytes", "payload_items")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.payload_bytes = 0
+        self.payload_items = 0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a latency quantile by interpolating within its bucket
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, n in enumerate(self.buckets):
+            upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max
+            if n and seen + n >= rank:
+                # Never report more than the slowest observed call
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+            lower = upper
+        return self.max
+
+
+class Metrics:
+    """
+    Thread-safe registry of timings and cache counters
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings: dict[str, _Timing] = {}
+        self._cache_lookups: dict[str, int] = {}
+        self._cache_misses: dict[str, int] = {}
+        self.started_at = time.time()
+
+    def observe(self, name: str, seconds: float, error: bool = False, payload_bytes: int = 0, payload_items: int = 0):
+        with self._lock:
+            t = self._timings.get(name)
+            if t is None:
+                t = self._timings[name] = _Timing()
+            t.count += 1
+            t.errors += int(error)
+            t.total += seconds
+            t.max = max(t.max, seconds)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    t.buckets[i] += 1
+                    break
+            else:
+                t.buckets[-1] += 1
+            t.payload_bytes += payload_bytes
+            t.payload_items += payload_items
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps({
+                "event": "call", "name": name, "seconds": round(seconds, 6), "error": error,
+                "payload_bytes": payload_bytes, "payload_items": payload_items,
+            }))
+
+    def cache_lookup(self, name: str, hit: bool | None = None):
+        """
+        Count a cache lookup; pass `hit` when it is known here, otherwise
+        record misses separately with cache_miss
+        """
+        with self._lock:
+            self._cache_lookups[name] = self._cache_lookups.get(name, 0) + 1
+            if hit is False:
+                self._cache_misses[name] = self._cache_misses.get(name, 0) + 1
+
+    def cache_miss(self, name: str):
+        with self._lock:
+            self._cache_misses[name] = self._cache_misses.get(name, 0) + 1
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            # BaseExceptions (e.g. Streamlit's st.stop/st.rerun) are control flow, not errors
+            error = True
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, error=error)
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+            self._cache_lookups.clear()
+            self._cache_misses.clear()
+            self.started_at = time.time()
+
+    # --- Export ---
+    def timings(self) -> list[dict]:
+        with self._lock:
+            items = sorted(self._timings.items())
+            return [{
+                "name": name,
+                "calls": t.count,
+                "errors": t.errors,
+                "mean_ms": 1000 * t.total / t.count if t.count else 0.0,
+                "p50_ms": 1000 * t.quantile(0.5),
+                "p95_ms": 1000 * t.quantile(0.95),
+                "p99_ms": 1000 * t.quantile(0.99),
+                "max_ms": 1000 * t.max,
+                "total_s": t.total,
+                "payload_bytes": t.payload_bytes,
+                "payload_items": t.payload_items,
+            } for name, t in items]
+
+    def caches(self) -> list[dict]:
+        with self._lock:
+            rows = []
+            for name in sorted(self._cache_lookups.keys() | self._cache_misses.keys()):
+                lookups = self._cache_lookups.get(name, 0)
+                misses = min(self._cache_misses.get(name, 0), lookups)
+                rows.append({
+                    "name": name,
+                    "lookups": lookups,
+                    "hits": lookups - misses,
+                    "misses": misses,
+                    "hit_ratio": (lookups - misses) / lookups if lookups else 0.0,
+                })
+            return rows
+
+    def prometheus_text(self, prefix: str = "trigger_job_app") -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+        """
+        lines = [
+            f"# HELP {prefix}_call_seconds Latency of Jobs API calls and instrumented helpers.",
+            f"# TYPE {prefix}_call_seconds histogram",
+        ]
+        with self._lock:
+            timings = sorted(self._timings.items())
+            lookups, misses = dict(self._cache_lookups), dict(self._cache_misses)
+        for name, t in timings:
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, t.buckets):
+                cumulative += n
+                lines.append(f'{prefix}_call_seconds_bucket{{name="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_call_seconds_bucket{{name="{name}",le="+Inf"}} {t.count}')
+            lines.append(f'{prefix}_call_seconds_sum{{name="{name}"}} {t.total:.6f}')
+            lines.append(f'{prefix}_call_seconds_count{{name="{name}"}} {t.count}')
+        lines += [f"# HELP {prefix}_call_errors_total Failed calls.", f"# TYPE {prefix}_call_errors_total counter"]
+        lines += [f'{prefix}_call_errors_total{{name="{name}"}} {t.errors}' for name, t in timings]
+        lines += [f"# HELP {prefix}_payload_bytes_total Response bytes of single-object API calls.",
+                  f"# TYPE {prefix}_payload_bytes_total counter"]
+        lines += [f'{prefix}_payload_bytes_total{{name="{name}"}} {t.payload_bytes}' for name, t in timings]
+        lines += [f"# HELP {prefix}_payload_items_total Items returned by paginated API calls.",
+                  f"# TYPE {prefix}_payload_items_total counter"]
+        lines += [f'{prefix}_payload_items_total{{name="{name}"}} {t.payload_items}' for name, t in timings]
+        lines += [f"# HELP {prefix}_cache_lookups_total Cache lookups.", f"# TYPE {prefix}_cache_lookups_total counter"]
+        lines += [f'{prefix}_cache_lookups_total{{name="{name}"}} {n}' for name, n in sorted(lookups.items())]
+        lines += [f"# HELP {prefix}_cache_misses_total Cache misses.", f"# TYPE {prefix}_cache_misses_total counter"]
+        lines += [f'{prefix}_cache_misses_total{{name="{name}"}} {n}' for name, n in sorted(misses.items())]
+        return "\n".join(lines) + "\n"
+
+    def log_snapshot(self) -> bool:
+        """
+        Emit one structured (JSON) log record per timing and cache.
+        Returns False, logging nothing, if the logger drops INFO records.
+        """
+        if not logger.isEnabledFor(logging.INFO):
+            return False
+        for row in self.timings():
+            logger.info(json.dumps({"event": "timing", **row}))
+        for row in self.caches():
+            logger.info(json.dumps({"event": "cache", **row}))
+        return True
+
+
+metrics = Metrics()
+
+
+def timed(name: str):
+    """
+    Decorator recording the latency of every call of a helper
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with metrics.timer(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def configure_logging():
+    """
+    Send metrics records to stderr at METRICS_LOG_LEVEL, unless the
+    logger was already configured
+    """
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(METRICS_LOG_LEVEL)
+    logger.propagate = False
+
+
+def _payload_bytes(obj) -> int:
+    as_dict = getattr(obj, "as_dict", None)
+    if as_dict is None:
+        return 0
+    try:
+        return len(json.dumps(as_dict(), default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class _InstrumentedAPI:
+    """
+    Proxy around an SDK service (e.g. w.jobs) timing every method call.
+    Paginated methods return generators; only the time spent fetching
+    items is counted, not the caller's work between items.
+    """
+
+    def __init__(self, api, prefix: str):
+        self._api = api
+        self._prefix = prefix
+
+    def __getattr__(self, attr):
+        target = getattr(self._api, attr)
+        if not callable(target) or attr.startswith("_"):
+            return target
+        name = f"{self._prefix}.{attr}"
+
+        @functools.wraps(target)
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = target(*args, **kwargs)
+            except Exception:
+                metrics.observe(name, time.perf_counter() - start, error=True)
+                raise
+            if hasattr(result, "__next__"):
+                return self._timed_iter(name, result, time.perf_counter() - start)
+            metrics.observe(name, time.perf_counter() - start, payload_bytes=_payload_bytes(result))
+            return result
+        return call
+
+    @staticmethod
+    def _timed_iter(name, it, elapsed):
+        items = 0
+        error = False
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    elapsed += time.perf_counter() - start
+                    return
+                except Exception:
+                    elapsed += time.perf_counter() - start
+                    error = True
+                    raise
+                elapsed += time.perf_counter() - start
+                items += 1
+                yield item
+        finally:
+            # Also runs when the caller stops early (islice) and closes the generator
+            metrics.observe(name, elapsed, error=error, payload_items=items)
+
+
+class InstrumentedClient:
+    """
+    WorkspaceClient wrapper whose `jobs` service is instrumented; every
+    other attribute is passed through unchanged
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self.jobs = _InstrumentedAPI(client.jobs, "jobs")
+
+    def __getattr__(self, attr):
+        return getattr(self._client, attr)
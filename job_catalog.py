@@ -0,0 +1,313 @@
+"""
+Process-wide job catalog shared by all pages.
+
+Keeps a compact record per job, including the parameter metadata the Trigger
+Job page needs (parameter styles, task keys, job parameter defaults) derived
+once from the task-expanded listing. Refreshes it in the background by diffing
+against the previous crawl and persists a snapshot to local disk so a freshly
+started app can render the job list before the first crawl completes.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+
+from databricks.sdk import WorkspaceClient
+from instrumentation import metrics, timed
+from job_search import DEFAULT_LIMIT, JobSearchIndex
+from utils import detect_param_modes
+
+logger = logging.getLogger(__name__)
+
+CATALOG_TTL_SECONDS = int(os.environ.get("JOB_CATALOG_TTL_SECONDS", "60"))
+SNAPSHOT_PATH = os.environ.get(
+    "JOB_CATALOG_SNAPSHOT",
+    os.path.join(tempfile.gettempdir(), "trigger_job_app", "job_catalog.json"),
+)
+# Largest page size accepted by the Jobs list endpoint
+LIST_PAGE_SIZE = 100
+# Bumped whenever JobRecord gains fields, so older snapshots are ignored
+SNAPSHOT_VERSION = 2
+
+
+@dataclass(frozen=True, slots=True)
+class JobRecord:
+    """
+    Compact, immutable view of a job holding only what the pages display
+    """
+    job_id: int
+    name: str
+    creator: str = ""
+    created_time: int = 0
+    tags: tuple = ()
+    # Task-specific run-now parameter styles accepted by the job's tasks
+    param_modes: tuple = ()
+    task_keys: tuple = ()
+    # (name, default) pairs of the job-level parameters
+    default_params: tuple = ()
+    # The listing held only the first page of tasks; fetch details for the rest
+    tasks_truncated: bool = False
+
+    @classmethod
+    def from_job(cls, job):
+        settings = getattr(job, "settings", None)
+        tags = getattr(settings, "tags", None) or {}
+        tasks = getattr(settings, "tasks", None) or []
+        parameters = getattr(settings, "parameters", None) or []
+        return cls(
+            job_id=job.job_id,
+            name=getattr(settings, "name", None) or "",
+            creator=getattr(job, "creator_user_name", None) or "",
+            created_time=getattr(job, "created_time", None) or 0,
+            tags=tuple(sorted((str(k), str(v)) for k, v in tags.items())),
+            param_modes=tuple(sorted(detect_param_modes(tasks))),
+            task_keys=tuple(t.task_key for t in tasks if t.task_key),
+            default_params=tuple((p.name, p.default or "") for p in parameters if p.name),
+            tasks_truncated=bool(getattr(job, "has_more", False)),
+        )
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "name": self.name,
+            "creator": self.creator,
+            "created_time": self.created_time,
+            "tags": [list(t) for t in self.tags],
+            "param_modes": list(self.param_modes),
+            "task_keys": list(self.task_keys),
+            "default_params": [list(p) for p in self.default_params],
+            "tasks_truncated": self.tasks_truncated,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            job_id=int(d["job_id"]),
+            name=d.get("name", ""),
+            creator=d.get("creator", ""),
+            created_time=d.get("created_time", 0),
+            tags=tuple(tuple(t) for t in d.get("tags", [])),
+            param_modes=tuple(d.get("param_modes", [])),
+            task_keys=tuple(d.get("task_keys", [])),
+            default_params=tuple(tuple(p) for p in d.get("default_params", [])),
+            tasks_truncated=bool(d.get("tasks_truncated", False)),
+        )
+
+
+@dataclass(frozen=True)
+class CatalogDiff:
+    """
+    Result of comparing one crawl against the previous one
+    """
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+
+    @property
+    def empty(self):
+        return not (self.added or self.removed or self.changed)
+
+
+class JobCatalog:
+    """
+    Shared, thread-safe job list with stale-while-refresh semantics.
+
+    Readers always get the last known list immediately; once it is older than
+    the TTL a single background thread re-crawls the workspace and swaps in
+    the new records.
+    """
+
+    def __init__(self, w: WorkspaceClient, ttl: int = CATALOG_TTL_SECONDS, snapshot_path: str = SNAPSHOT_PATH):
+        self._w = w
+        self._ttl = ttl
+        self._snapshot_path = snapshot_path
+        self._lock = threading.Lock()
+        self._records: dict[int, JobRecord] = {}
+        self._sorted: list[JobRecord] = []
+        self._index = JobSearchIndex([])
+        self._refreshed_at = 0.0
+        self._refreshing = False
+        # Set when the crawl in flight (if any) ends, so cold-start readers can wait for it
+        self._crawl_done = threading.Event()
+        self._crawl_done.set()
+        self.last_diff = CatalogDiff()
+        self.last_error = None
+        self.from_snapshot = self._load_snapshot()
+
+    # --- Public API ---
+    def jobs(self) -> list[JobRecord]:
+        """
+        Return all jobs sorted by name, triggering a refresh if needed.
+        Only blocks when there is neither a crawl nor a snapshot to serve;
+        raises the crawl error if there is still nothing to serve then.
+        """
+        if not self._sorted and self._refreshed_at == 0:
+            metrics.cache_lookup("job_catalog", hit=False)
+            self.refresh()
+        else:
+            # Stale reads still count as hits: they are served without waiting
+            metrics.cache_lookup("job_catalog", hit=True)
+            if self.is_stale():
+                self.refresh_async()
+        if not self._sorted and self.last_error is not None:
+            # An empty list would read as "no jobs"; surface why there are none
+            raise self.last_error
+        return self._sorted
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list[JobRecord]:
+        """
+        Typeahead lookup over name, job ID, tags and creator
+        """
+        self.jobs()
+        with metrics.timer("job_catalog.search"):
+            return self._index.search(query, limit)
+
+    def get(self, job_id: int):
+        return self._records.get(job_id)
+
+    def is_stale(self) -> bool:
+        return time.time() - self._refreshed_at > self._ttl
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self._refreshed_at if self._refreshed_at else float("inf")
+
+    @property
+    def refreshing(self) -> bool:
+        return self._refreshing
+
+    def refresh_async(self):
+        """
+        Start a background refresh unless one is already running
+        """
+        done = self._start_refresh()
+        if done is not None:
+            threading.Thread(target=self._refresh_locked, args=(done,), name="job-catalog-refresh", daemon=True).start()
+
+    def refresh(self):
+        """
+        Crawl the workspace synchronously (used for a cold start), or wait
+        for the crawl already in flight
+        """
+        done = self._start_refresh()
+        if done is not None:
+            self._refresh_locked(done)
+        else:
+            self._crawl_done.wait()
+
+    # --- Internals ---
+    def _start_refresh(self) -> threading.Event | None:
+        """
+        Claim the next crawl and return the event its end sets; None if one
+        is already running
+        """
+        with self._lock:
+            if self._refreshing:
+                return None
+            self._refreshing = True
+            self._crawl_done = threading.Event()
+            return self._crawl_done
+
+    def _refresh_locked(self, done: threading.Event):
+        try:
+            crawled = self._crawl()
+            diff = self._apply(crawled)
+            self.last_diff = diff
+            self.last_error = None
+            self._refreshed_at = time.time()
+            self.from_snapshot = False
+            if not diff.empty:
+                self._save_snapshot()
+        except Exception as e:
+            # Keep serving the previous list; retry after the next TTL expiry
+            logger.warning("Job catalog refresh failed: %s", e)
+            self.last_error = e
+            self._refreshed_at = time.time()
+        finally:
+            # This crawl's own event, set before another crawl can be claimed and replace it
+            done.set()
+            self._refreshing = False
+
+    @timed("job_catalog.crawl")
+    def _crawl(self) -> dict[int, JobRecord]:
+        return {
+            job.job_id: JobRecord.from_job(job)
+            # Tasks are needed for the parameter metadata; a job's first 100 come with the listing
+            for job in self._w.jobs.list(expand_tasks=True, limit=LIST_PAGE_SIZE)
+        }
+
+    def _apply(self, crawled: dict[int, JobRecord]) -> CatalogDiff:
+        old = self._records
+        added = crawled.keys() - old.keys()
+        removed = old.keys() - crawled.keys()
+        changed = sum(1 for job_id in crawled.keys() & old.keys() if crawled[job_id] != old[job_id])
+        diff = CatalogDiff(added=len(added), removed=len(removed), changed=changed)
+        if diff.empty:
+            return diff
+        # Reuse unchanged record objects so memory is shared with the previous list
+        records = {job_id: old.get(job_id) if old.get(job_id) == rec else rec for job_id, rec in crawled.items()}
+        ordered = sorted(records.values(), key=lambda r: (r.name.lower(), r.job_id))
+        # Build the search index before publishing so readers never see a mismatch
+        self._index = JobSearchIndex(ordered)
+        self._records = records
+        self._sorted = ordered
+        return diff
+
+    def _host(self):
+        try:
+            return self._w.config.host
+        except Exception:
+            return None
+
+    def _load_snapshot(self) -> bool:
+        try:
+            with open(self._snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("host") != self._host() or data.get("version") != SNAPSHOT_VERSION:
+            return False
+        try:
+            records = {r.job_id: r for r in (JobRecord.from_dict(d) for d in data.get("jobs", []))}
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Ignoring unreadable job catalog snapshot: %s", e)
+            return False
+        self._apply(records)
+        # Serve the snapshot right away but treat it as stale so a crawl starts
+        self._refreshed_at = 0.0 if not records else time.time() - self._ttl - 1
+        return bool(records)
+
+    def _save_snapshot(self):
+        payload = {
+            "host": self._host(),
+            "version": SNAPSHOT_VERSION,
+            "saved_at": time.time(),
+            "jobs": [r.to_dict() for r in self._sorted],
+        }
+        try:
+            os.makedirs(os.path.dirname(self._snapshot_path), exist_ok=True)
+            tmp_path = f"{self._snapshot_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, self._snapshot_path)
+        except OSError as e:
+            logger.warning("Could not write job catalog snapshot: %s", e)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_job_catalog(w: WorkspaceClient) -> JobCatalog:
+    """
+    Return the process-wide catalog, creating it on first use
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = JobCatalog(w)
+    return _catalog
@@ -0,0 +1,138 @@
+"""
+Process-wide cache of full job details with background prefetching.
+
+The Trigger Job page renders from the metadata the job catalog derives from
+its listing, so it never has to wait for jobs/get. Full details are still
+fetched, off the request path, for the jobs a user is likely to open next
+(recently used ones and the top matches of the job picker) and replace the
+listing metadata once they arrive. Only jobs whose task list was truncated
+in the listing are fetched synchronously.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from databricks.sdk import WorkspaceClient
+from instrumentation import metrics
+
+logger = logging.getLogger(__name__)
+
+DETAILS_TTL_SECONDS = int(os.environ.get("JOB_DETAILS_TTL_SECONDS", "60"))
+PREFETCH_WORKERS = int(os.environ.get("JOB_DETAILS_PREFETCH_WORKERS", "4"))
+# Jobs whose details are kept in memory
+MAX_CACHED_JOBS = 512
+# Prefetches queued at most at once; further requests are dropped until they drain
+MAX_PENDING_PREFETCHES = 32
+
+
+class JobDetailsCache:
+    """
+    Thread-safe LRU of jobs/get responses; concurrent requests for the same
+    job share one call
+    """
+
+    def __init__(self, w: WorkspaceClient, ttl: int = DETAILS_TTL_SECONDS, max_entries: int = MAX_CACHED_JOBS,
+                 workers: int = PREFETCH_WORKERS):
+        self._w = w
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, tuple[float, object]] = OrderedDict()
+        self._inflight: dict[int, Future] = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-prefetch")
+
+    def peek(self, job_id: int):
+        """
+        Return the cached details of a job if fresh, else None; never blocks
+        """
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is None or time.time() - entry[0] > self._ttl:
+                metrics.cache_lookup("job_details", hit=False)
+                return None
+            self._entries.move_to_end(job_id)
+        metrics.cache_lookup("job_details", hit=True)
+        return entry[1]
+
+    def get(self, job_id: int):
+        """
+        Return the details of a job, fetching them (or waiting for a fetch
+        already in flight) when they are not cached
+        """
+        job = self.peek(job_id)
+        if job is not None:
+            return job
+        future, owner = self._claim(job_id)
+        if owner:
+            self._fetch(job_id, future)
+        return future.result()
+
+    def prefetch(self, job_ids):
+        """
+        Fetch the details of jobs in the background unless cached or already in flight
+        """
+        now = time.time()
+        for job_id in job_ids:
+            with self._lock:
+                entry = self._entries.get(job_id)
+                if entry is not None and now - entry[0] <= self._ttl:
+                    continue
+                if len(self._inflight) >= MAX_PENDING_PREFETCHES:
+                    return
+            future, owner = self._claim(job_id)
+            if owner:
+                self._pool.submit(self._fetch, job_id, future)
+
+    # --- Internals ---
+    def _claim(self, job_id: int) -> tuple[Future, bool]:
+        with self._lock:
+            future = self._inflight.get(job_id)
+            if future is not None:
+                return future, False
+            future = self._inflight[job_id] = Future()
+            return future, True
+
+    def _fetch(self, job_id: int, future: Future):
+        try:
+            job = self._get_all_pages(job_id)
+            with self._lock:
+                self._entries[job_id] = (time.time(), job)
+                self._entries.move_to_end(job_id)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+            future.set_result(job)
+        except Exception as e:
+            logger.debug("Fetching details of job %s failed: %s", job_id, e)
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(job_id, None)
+
+    def _get_all_pages(self, job_id: int):
+        # jobs/get returns at most 100 tasks per page; follow next_page_token for the rest
+        job = self._w.jobs.get(job_id=job_id)
+        while job.next_page_token:
+            page = self._w.jobs.get(job_id=job_id, page_token=job.next_page_token)
+            job.settings.tasks = (job.settings.tasks or []) + (page.settings.tasks or [])
+            job.next_page_token = page.next_page_token
+        job.has_more = False
+        return job
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_job_details_cache(w: WorkspaceClient) -> JobDetailsCache:
+    """
+    Return the process-wide job details cache, creating it on first use
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = JobDetailsCache(w)
+    return _cache
@@ -0,0 +1,112 @@
+"""
+In-memory typeahead index over job records.
+
+Matches query terms against job name, job ID, tags and creator using token
+prefixes plus trigram similarity, so partial words and fragments from inside
+a word still hit. This is not typo tolerant: a transposed or missing letter
+drops too many of a term's trigrams to match.
+"""
+import bisect
+import heapq
+import re
+from collections import Counter, defaultdict
+
+DEFAULT_LIMIT = 50
+# Share of a term's trigrams a job must contain to count as a fuzzy match
+TRIGRAM_THRESHOLD = 0.6
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Scores per match kind; a job's score is summed over all query terms
+_SCORE_ID = 10.0
+_SCORE_EXACT_TOKEN = 3.0
+_SCORE_PREFIX = 2.0
+
+
+def _trigrams(token: str, pad_end: bool = True) -> set[str]:
+    padded = f" {token} " if pad_end else f" {token}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class JobSearchIndex:
+    """
+    Prebuilt search structure; build once per catalog refresh, query many times
+    """
+
+    def __init__(self, records):
+        self._records = list(records)
+        self._by_id: dict[int, int] = {}
+        token_docs: dict[str, set[int]] = defaultdict(set)
+        trigram_docs: dict[str, set[int]] = defaultdict(set)
+
+        for idx, rec in enumerate(self._records):
+            self._by_id[rec.job_id] = idx
+            fields = [rec.name, str(rec.job_id), rec.creator]
+            fields.extend(f"{k} {v}" for k, v in rec.tags)
+            for token in _TOKEN_RE.findall(" ".join(fields).lower()):
+                if idx in token_docs[token]:
+                    continue
+                token_docs[token].add(idx)
+                for tri in _trigrams(token):
+                    trigram_docs[tri].add(idx)
+
+        self._token_docs = dict(token_docs)
+        self._sorted_tokens = sorted(token_docs)
+        self._trigram_docs = dict(trigram_docs)
+
+    def __len__(self):
+        return len(self._records)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT):
+        """
+        Return up to `limit` records matching every term of `query`, best first.
+        An empty query returns the first records in catalog order.
+        """
+        terms = _TOKEN_RE.findall((query or "").lower())
+        if not terms:
+            return self._records[:limit]
+
+        scores = None
+        for term in terms:
+            term_scores = self._match_term(term)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {i: s + term_scores[i] for i, s in scores.items() if i in term_scores}
+            if not scores:
+                return []
+
+        # Ties keep catalog order (already sorted by name)
+        best = heapq.nsmallest(limit, scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [self._records[i] for i, _ in best]
+
+    def _match_term(self, term: str) -> dict[int, float]:
+        scores: dict[int, float] = {}
+
+        def bump(idx, score):
+            if scores.get(idx, 0.0) < score:
+                scores[idx] = score
+
+        if term.isdigit() and int(term) in self._by_id:
+            bump(self._by_id[int(term)], _SCORE_ID)
+
+        # Prefix matches: contiguous slice of the sorted token list
+        lo = bisect.bisect_left(self._sorted_tokens, term)
+        hi = bisect.bisect_left(self._sorted_tokens, term + "\x7f", lo)
+        for token in self._sorted_tokens[lo:hi]:
+            score = _SCORE_EXACT_TOKEN if token == term else _SCORE_PREFIX
+            for idx in self._token_docs[token]:
+                bump(idx, score)
+
+        # Trigram similarity catches infix matches
+        if len(term) >= 3:
+            grams = _trigrams(term, pad_end=False)
+            counts = Counter()
+            for gram in grams:
+                counts.update(self._trigram_docs.get(gram, ()))
+            needed = len(grams) * TRIGRAM_THRESHOLD
+            for idx, hits in counts.items():
+                if hits >= needed:
+                    bump(idx, hits / len(grams))
+
+        return scores
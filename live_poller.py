@@ -0,0 +1,144 @@
+"""
+Adaptive polling of in-flight runs for the live run view.
+
+Only runs that are not yet terminal are polled, each on its own schedule:
+fast right after a status change, backing off while nothing changes, and
+dropped once the run has ended or no session has asked for it in a while.
+The schedule is process-wide, so several
+sessions watching the same job share one stream of get_run calls. A run
+that fails to poll backs off without holding up the others; a run that no
+longer exists is removed from the store.
+"""
+import logging
+import threading
+import time
+
+from databricks.sdk import WorkspaceClient
+from databricks.sdk.errors import NotFound
+from run_normalizer import extract_runs
+from run_store import RunStore
+
+logger = logging.getLogger(__name__)
+
+# First poll interval (seconds) after a run is seen in a given status
+POLL_INTERVALS = {
+    "PENDING": 3.0,
+    "TERMINATING": 3.0,
+    "RUNNING": 5.0,
+    "QUEUED": 10.0,
+    "BLOCKED": 15.0,
+    "WAITING": 15.0,
+}
+DEFAULT_POLL_INTERVAL = 10.0
+BACKOFF_FACTOR = 1.5
+MAX_POLL_INTERVAL = 60.0
+# Schedules of runs no poll() call has asked for in this long are dropped
+# (the sessions watching them closed or moved on)
+UNWATCHED_TTL_SECONDS = 5 * MAX_POLL_INTERVAL
+
+
+class _Schedule:
+    __slots__ = ("status", "interval", "next_at", "seen_at")
+
+    def __init__(self, status: str, interval: float, next_at: float, seen_at: float):
+        self.status = status
+        self.interval = interval
+        self.next_at = next_at
+        self.seen_at = seen_at
+
+
+class RunPoller:
+    """
+    Tracks when each active run is next due for a status poll
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schedules: dict[int, _Schedule] = {}
+
+    def _claim_due(self, run_ids, now: float) -> list[int]:
+        """
+        Pick the runs that are due and push their next poll out, so a
+        concurrent session does not poll the same run again. Also drops the
+        schedules of runs nobody has asked for within UNWATCHED_TTL_SECONDS.
+        """
+        due = []
+        with self._lock:
+            for run_id in run_ids:
+                sched = self._schedules.get(run_id)
+                if sched is None:
+                    self._schedules[run_id] = _Schedule("", DEFAULT_POLL_INTERVAL, now + DEFAULT_POLL_INTERVAL, now)
+                    due.append(run_id)
+                    continue
+                sched.seen_at = now
+                if sched.next_at <= now:
+                    sched.next_at = now + sched.interval
+                    due.append(run_id)
+            unwatched = [r for r, sched in self._schedules.items() if now - sched.seen_at > UNWATCHED_TTL_SECONDS]
+            for run_id in unwatched:
+                del self._schedules[run_id]
+        return due
+
+    def next_poll_in(self, run_ids) -> float | None:
+        """
+        Seconds until the soonest of `run_ids` is due, or None if none are tracked
+        """
+        now = time.time()
+        with self._lock:
+            times = [self._schedules[r].next_at - now for r in run_ids if r in self._schedules]
+        return max(0.0, min(times)) if times else None
+
+    def poll(self, w: WorkspaceClient, store: RunStore, run_ids) -> dict[int, str]:
+        """
+        Poll the due runs among `run_ids`, write them to the store and
+        return {run_id: new_status} for runs whose status changed
+        """
+        now = time.time()
+        changed = {}
+        for run_id in self._claim_due(run_ids, now):
+            try:
+                cols = extract_runs([w.jobs.get_run(run_id=run_id)])
+            except NotFound:
+                # Deleted runs would otherwise stay active in the store, and keep syncs re-listing their window
+                store.delete_runs([run_id])
+                with self._lock:
+                    self._schedules.pop(run_id, None)
+                continue
+            except Exception as e:
+                logger.warning("Polling run %s failed: %s", run_id, e)
+                with self._lock:
+                    sched = self._schedules.get(run_id)
+                    if sched is not None:
+                        sched.interval = min(sched.interval * BACKOFF_FACTOR, MAX_POLL_INTERVAL)
+                        sched.next_at = time.time() + sched.interval
+                continue
+            store.upsert(cols)
+            status, ended = cols["status"][0], cols["end_time"][0] > 0
+            with self._lock:
+                sched = self._schedules.get(run_id)
+                if sched is None:
+                    continue
+                if sched.status and sched.status != status:
+                    changed[run_id] = status
+                if ended:
+                    # Terminal runs never change again
+                    del self._schedules[run_id]
+                    changed.setdefault(run_id, status)
+                    continue
+                if status != sched.status:
+                    sched.interval = POLL_INTERVALS.get(status, DEFAULT_POLL_INTERVAL)
+                else:
+                    sched.interval = min(sched.interval * BACKOFF_FACTOR, MAX_POLL_INTERVAL)
+                sched.status = status
+                sched.next_at = time.time() + sched.interval
+        return changed
+
+
+_poller = RunPoller()
+
+
+def get_run_poller() -> RunPoller:
+    """
+    Return the process-wide poller
+    """
+    return _poller
@@ -0,0 +1,89 @@
+"""
+Inverted index over run parameters, for provenance lookups.
+
+Every run the run store writes also gets one (name, value) posting per
+parameter it ran with: its job_parameters, or else the notebook_params,
+python_named_params and python_params it overrode (the fields the run table
+shows, see run_normalizer.OVERRIDE_PARAM_FIELDS). Positional values of the
+form `--name=value`, like the `--triggered_by=` item of list-style runs, or
+`--name` followed by a value, are indexed under that name. Postings live
+next to the runs in SQLite, so the index grows with every sync and backfill,
+and "runs where name = value" is an index range scan instead of a read of
+every stored run's parameters.
+Values match case-insensitively (ASCII).
+"""
+import shlex
+from dataclasses import dataclass
+
+# Longer values are indexed (and matched) by their first this many characters
+MAX_INDEXED_VALUE_CHARS = 256
+# Most terms in one provenance query
+MAX_QUERY_TERMS = 8
+
+
+def index_terms(params) -> list[tuple[str, str]]:
+    """
+    Postings of one run's parameters, given as (name, value) pairs with an
+    empty name for positional values (see run_normalizer.extract_runs)
+    """
+    terms = []
+    # A positional `--name` waiting for its value
+    flag = None
+    for name, value in params:
+        if not name and flag is not None and not value.startswith("--"):
+            name, flag = flag[2:], None
+        if flag is not None:
+            terms.append(("", flag))
+            flag = None
+        if not name and value.startswith("--"):
+            if "=" not in value:
+                flag = value
+                continue
+            name, value = value[2:].split("=", 1)
+        terms.append((name, value[:MAX_INDEXED_VALUE_CHARS]))
+    if flag is not None:
+        terms.append(("", flag))
+    return terms
+
+
+@dataclass(frozen=True, slots=True)
+class ParamTerm:
+    """
+    One condition of a provenance query; an empty name matches any parameter
+    """
+    name: str
+    value: str
+    prefix: bool = False
+
+    def __str__(self) -> str:
+        value = self.value + ("*" if self.prefix else "")
+        return f"{self.name}={value}" if self.name else value
+
+
+def parse_query(text: str) -> list[ParamTerm]:
+    """
+    Parse a query of space-separated terms that must all match:
+    `name=value` for a parameter, a bare `value` for any parameter, and a
+    trailing `*` for a prefix match. Quote terms that contain spaces.
+    """
+    try:
+        tokens = shlex.split(text)
+    except ValueError as e:
+        raise ValueError(f"Could not parse query: {e}") from None
+    if len(tokens) > MAX_QUERY_TERMS:
+        raise ValueError(f"At most {MAX_QUERY_TERMS} terms are supported")
+    terms = []
+    for token in tokens:
+        name, sep, value = token.partition("=")
+        if not sep:
+            name, value = "", token
+        elif name.startswith("--"):
+            name = name[2:]
+        prefix = value.endswith("*")
+        value = value.rstrip("*")[:MAX_INDEXED_VALUE_CHARS]
+        if not value and not prefix:
+            raise ValueError(f"'{token}' has no value; use '{token}*' to match any value")
+        if not name and not value:
+            raise ValueError("A term needs a name or a value")
+        terms.append(ParamTerm(name=name.strip(), value=value, prefix=prefix))
+    return terms
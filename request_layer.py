@@ -0,0 +1,257 @@
+"""
+Shared request layer under every Jobs API call of the process.
+
+All helpers reach the workspace through the one WorkspaceClient built in
+client.py, and every SDK service call ends in its ApiClient's `do`. The
+layer installed there:
+
+- merges identical GET requests in flight into one call (singleflight),
+  including the individual pages of paginated listings;
+- spends a token from a process-wide bucket before each request, so all
+  sessions together stay under the workspace's API limits;
+- shares backoff: when the SDK retries a throttled request (a 429, or any
+  response carrying Retry-After), the wait is jittered and opens a
+  throttle window that every other request also respects. Retries of
+  other failures (dropped connections, timeouts, 5xx) only wait on their
+  own thread;
+- serves the last response of a job or run listing or lookup, if recent
+  enough, while the window is open, instead of queueing behind the
+  throttle. Kept responses are bounded in total size.
+"""
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from databricks.sdk.clock import RealClock
+from databricks.sdk.errors import TooManyRequests
+from instrumentation import metrics
+from rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Sustained requests per second across all sessions, and the burst allowed above it
+API_RATE_PER_SECOND = float(os.environ.get("API_RATE_PER_SECOND", "20"))
+API_BURST = float(os.environ.get("API_BURST", "40"))
+# Responses older than this are never served stale
+STALE_MAX_AGE_SECONDS = int(os.environ.get("API_STALE_MAX_AGE_SECONDS", "300"))
+# Total size of the responses kept for stale serving; a larger response is not kept
+STALE_CACHE_BYTES = int(float(os.environ.get("API_STALE_CACHE_MB", "16")) * 1024 * 1024)
+# Endpoints whose responses are kept for stale serving (path suffixes): job and
+# run listings and lookups the pages render from, not run outputs
+STALE_PATHS = ("/jobs/list", "/jobs/get", "/jobs/runs/list", "/jobs/runs/get")
+# Backoff waits are stretched by up to this fraction, so throttled callers don't retry in lockstep
+BACKOFF_JITTER = 0.5
+
+
+class RequestLayer:
+    """
+    Wraps an ApiClient `do` function with singleflight, rate limiting,
+    shared backoff and stale serving
+    """
+
+    def __init__(self, do, rate: float = API_RATE_PER_SECOND, burst: float = API_BURST,
+                 stale_max_age: float = STALE_MAX_AGE_SECONDS, stale_bytes: int = STALE_CACHE_BYTES):
+        self._do = do
+        self._bucket = TokenBucket(rate, burst)
+        self._stale_max_age = stale_max_age
+        self._stale_bytes = stale_bytes
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        # key -> (stored at, response, size); oldest first
+        self._stale: OrderedDict[str, tuple[float, object, int]] = OrderedDict()
+        self._stale_size = 0
+        self._throttled_until = 0.0
+        # Whether the last failed attempt on each thread was throttled by the platform
+        self._attempt = threading.local()
+
+    # --- Backoff ---
+    def record_response(self, response, *args, **kwargs):
+        """
+        Session response hook: note whether the platform asked this thread
+        to back off (Retry-After). The SDK fills in `retry_after_secs` for a
+        503 without the header too, so the error alone does not tell.
+        """
+        self._attempt.retry_after = "Retry-After" in response.headers
+        return response
+
+    def record_attempt_error(self, error: BaseException | None):
+        """
+        Note how the last HTTP attempt of this thread failed (None: it
+        succeeded), for the retry sleep that follows it
+        """
+        retry_after = getattr(self._attempt, "retry_after", False)
+        self._attempt.retry_after = False
+        self._attempt.throttled = error is not None and (
+            isinstance(error, TooManyRequests)
+            or (retry_after and getattr(error, "retry_after_secs", None) is not None)
+        )
+
+    def last_attempt_throttled(self) -> bool:
+        return getattr(self._attempt, "throttled", False)
+
+    def backoff(self, seconds: float):
+        """
+        Record a throttled retry of `seconds` and sleep through it, jittered.
+        Called by the SDK's retry loop through BackoffClock.
+        """
+        wait = seconds * random.uniform(1.0, 1.0 + BACKOFF_JITTER)
+        with self._lock:
+            self._throttled_until = max(self._throttled_until, time.monotonic() + wait)
+        metrics.observe("api.backoff", wait)
+        logger.debug("API throttled; backing off %.1fs", wait)
+        time.sleep(wait)
+
+    def throttled_for(self) -> float:
+        """
+        Seconds left in the current throttle window (0 if not throttled)
+        """
+        with self._lock:
+            return max(0.0, self._throttled_until - time.monotonic())
+
+    def _wait_turn(self, allow_stale: bool) -> bool:
+        """
+        Wait out the throttle window and take a token. With `allow_stale`,
+        return False instead of waiting while a throttle window is open.
+        """
+        throttled = self.throttled_for()
+        if throttled:
+            if allow_stale:
+                return False
+            time.sleep(throttled * random.uniform(1.0, 1.0 + BACKOFF_JITTER))
+        start = time.monotonic()
+        self._bucket.acquire()
+        waited = time.monotonic() - start
+        if waited > 0.001:
+            metrics.observe("api.rate_limit_wait", waited)
+        return True
+
+    # --- Requests ---
+    def _drop_stale(self, key: str):
+        entry = self._stale.pop(key, None)
+        if entry is not None:
+            self._stale_size -= entry[2]
+
+    def _stale_copy(self, key: str):
+        with self._lock:
+            entry = self._stale.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self._stale_max_age:
+                self._drop_stale(key)
+                return None
+            return entry[1]
+
+    def _remember(self, key: str, response):
+        try:
+            size = len(json.dumps(response, default=str))
+        except (TypeError, ValueError):
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._drop_stale(key)
+            if size <= self._stale_bytes:
+                self._stale[key] = (now, response, size)
+                self._stale_size += size
+            # Entries are in storage order: evict expired ones, then the oldest until under budget
+            while self._stale:
+                oldest_key, (stored_at, _, _) = next(iter(self._stale.items()))
+                if now - stored_at <= self._stale_max_age and self._stale_size <= self._stale_bytes:
+                    break
+                self._drop_stale(oldest_key)
+
+    def do(self, method: str, path: str | None = None, url: str | None = None, query: dict | None = None,
+           headers: dict | None = None, body: dict | None = None, raw: bool = False, **kwargs):
+        """
+        Same signature as ApiClient.do
+        """
+        if method != "GET" or raw or kwargs.get("files") or kwargs.get("data"):
+            # Writes and streams are never merged or served stale
+            self._wait_turn(allow_stale=False)
+            return self._do(method, path=path, url=url, query=query, headers=headers, body=body, raw=raw, **kwargs)
+
+        key = json.dumps([path or url, query, body], sort_keys=True, default=str)
+        keep_stale = (path or url or "").endswith(STALE_PATHS)
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        metrics.cache_lookup("api.singleflight", hit=not leader)
+        if not leader:
+            return future.result()
+
+        try:
+            stale = self._stale_copy(key) if keep_stale else None
+            if not self._wait_turn(allow_stale=stale is not None):
+                metrics.cache_lookup("api.stale_while_throttled", hit=True)
+                future.set_result(stale)
+                return stale
+            if stale is not None:
+                metrics.cache_lookup("api.stale_while_throttled", hit=False)
+            response = self._do(method, path=path, url=url, query=query, headers=headers, body=body, raw=raw, **kwargs)
+            if keep_stale:
+                self._remember(key, response)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+class BackoffClock(RealClock):
+    """
+    SDK clock whose sleeps (only used between retries of a failed request)
+    go through the request layer when the failure was a throttle (429 or
+    Retry-After); other retry sleeps stay local to the calling thread
+    """
+
+    def __init__(self):
+        self.layer: RequestLayer | None = None
+
+    def sleep(self, seconds: float) -> None:
+        if self.layer is not None and self.layer.last_attempt_throttled():
+            self.layer.backoff(seconds)
+        else:
+            super().sleep(seconds)
+
+
+def install_request_layer(client, clock: BackoffClock) -> RequestLayer:
+    """
+    Route every API call of a WorkspaceClient through a new request layer;
+    `clock` must be the clock the client's Config was created with
+    """
+    api_client = client.api_client
+    layer = RequestLayer(api_client.do)
+    # Services hold this ApiClient and call its `do`; the instance attribute takes precedence
+    api_client.do = layer.do
+    # The SDK's retry loop calls the base client's `_perform` once per attempt; seeing each
+    # attempt's error (and its session's response headers) tells the clock whether the
+    # sleep after it is a throttle backoff. Without those hooks (another SDK version),
+    # every retry sleep stays local.
+    base = getattr(api_client, "_api_client", None)
+    perform = getattr(base, "_perform", None)
+    session = getattr(base, "_session", None)
+    if perform is not None and session is not None:
+        session.hooks["response"].append(layer.record_response)
+
+        @functools.wraps(perform)
+        def perform_attempt(*args, **kwargs):
+            try:
+                response = perform(*args, **kwargs)
+            except BaseException as e:
+                layer.record_attempt_error(e)
+                raise
+            layer.record_attempt_error(None)
+            return response
+        base._perform = perform_attempt
+    clock.layer = layer
+    return layer
@@ -0,0 +1,230 @@
+"""
+Lazy drill-down into single runs: task runs, their outputs and error traces.
+
+Details are loaded only when a run row is expanded and kept in a process-wide
+LRU cache bounded by approximate size. Terminal runs never change, so their
+entries never expire; entries of runs still in flight expire after a short
+TTL. Outputs are fetched only for tasks that ended without succeeding, and
+long texts are cut to their tail, which is where tracebacks end. An output
+that cannot be fetched is reported on its task, and the run is fetched
+again after the same TTL.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from databricks.sdk import WorkspaceClient
+from instrumentation import metrics, timed
+from run_normalizer import run_status
+from utils import get_string_value
+
+# Approximate memory the cache may hold
+MAX_CACHE_BYTES = int(os.environ.get("RUN_DETAILS_CACHE_MB", "32")) * 1024 * 1024
+# Seconds before the details of a run still in flight are fetched again
+ACTIVE_TTL_SECONDS = int(os.environ.get("RUN_DETAILS_ACTIVE_TTL_SECONDS", "10"))
+# Characters kept of each error, trace and output text
+MAX_TEXT_CHARS = 20_000
+# Termination codes (v2 status) of tasks that ended without an error to show
+NO_OUTPUT_CODES = frozenset({"SUCCESS", "CANCELED", "USER_CANCELED", "SKIPPED", "DISABLED"})
+# Legacy result states of tasks that failed themselves (not upstream)
+FAILED_RESULTS = frozenset({"FAILED", "TIMEDOUT"})
+# Rough per-object overhead used in size estimates
+_TASK_OVERHEAD_BYTES = 400
+_RUN_OVERHEAD_BYTES = 600
+
+
+def _tail(text) -> str:
+    text = text or ""
+    return text if len(text) <= MAX_TEXT_CHARS else "…" + text[-MAX_TEXT_CHARS:]
+
+
+@dataclass(frozen=True, slots=True)
+class TaskRunDetail:
+    """
+    One task run of a job run, with its output if it failed
+    """
+    task_key: str
+    run_id: int
+    status: str
+    error_code: str = ""
+    start_time: int = 0
+    duration_s: int | None = None
+    attempt: int = 0
+    error: str = ""
+    error_trace: str = ""
+    output: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class RunDetail:
+    """
+    Drill-down view of one job run
+    """
+    run_id: int
+    status: str
+    error_code: str
+    terminal: bool
+    run_page_url: str
+    tasks: tuple
+    fetched_at: float
+    size: int
+
+
+def _has_error_output(task) -> bool:
+    if not (task.run_id and task.end_time):
+        return False
+    details = task.status.termination_details if task.status else None
+    if details and details.code:
+        return get_string_value(details.code) not in NO_OUTPUT_CODES
+    return bool(task.state) and get_string_value(task.state.result_state) in FAILED_RESULTS
+
+
+def _output_text(output) -> str:
+    if output.logs:
+        return output.logs
+    notebook = output.notebook_output
+    if notebook and notebook.result:
+        return notebook.result
+    return ""
+
+
+@timed("run_details.load")
+def load_run_detail(w: WorkspaceClient, run_id: int) -> RunDetail:
+    """
+    Fetch a run with its task runs, plus the output of every task that ended
+    without succeeding
+    """
+    run = w.jobs.get_run(run_id=run_id)
+    # runs/get returns at most 100 task runs per page; newer SDKs merge the pages, older ones
+    # leave next_page_token set, so follow it for the rest
+    run_tasks = list(run.tasks or [])
+    page_token = run.next_page_token
+    while page_token:
+        page = w.jobs.get_run(run_id=run_id, page_token=page_token)
+        run_tasks += page.tasks or []
+        page_token = page.next_page_token
+    status, error_code = run_status(run)
+    tasks = []
+    output_failed = False
+    for task in sorted(run_tasks, key=lambda t: (t.start_time or 0, t.task_key or "")):
+        task_status, task_error_code = run_status(task)
+        error = trace = output = ""
+        if _has_error_output(task):
+            try:
+                result = w.jobs.get_run_output(run_id=task.run_id)
+            except Exception as e:
+                # e.g. output no longer retained, or no permission; the other tasks still show
+                error = f"Could not load task output: {e}"
+                output_failed = True
+            else:
+                error, trace, output = _tail(result.error), _tail(result.error_trace), _tail(_output_text(result))
+        duration = task.execution_duration or (task.end_time - task.start_time if task.end_time and task.start_time else 0)
+        tasks.append(TaskRunDetail(
+            task_key=task.task_key or "",
+            run_id=task.run_id or 0,
+            status=task_status,
+            error_code=task_error_code,
+            start_time=task.start_time or 0,
+            duration_s=duration // 1000 if duration else None,
+            attempt=task.attempt_number or 0,
+            error=error,
+            error_trace=trace,
+            output=output,
+        ))
+    size = _RUN_OVERHEAD_BYTES + sum(
+        _TASK_OVERHEAD_BYTES + len(t.task_key) + len(t.error_code) + len(t.error) + len(t.error_trace) + len(t.output)
+        for t in tasks
+    )
+    return RunDetail(
+        run_id=run_id,
+        status=status,
+        error_code=error_code,
+        # A failed output fetch is retried like a run still in flight
+        terminal=bool(run.end_time) and not output_failed,
+        run_page_url=run.run_page_url or "",
+        tasks=tuple(tasks),
+        fetched_at=time.time(),
+        size=size,
+    )
+
+
+class RunDetailsCache:
+    """
+    Thread-safe LRU of run details bounded by approximate size in bytes
+    """
+
+    def __init__(self, max_bytes: int = MAX_CACHE_BYTES, active_ttl: float = ACTIVE_TTL_SECONDS):
+        self._max_bytes = max_bytes
+        self._active_ttl = active_ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, RunDetail] = OrderedDict()
+        self._bytes = 0
+        # Per-run load locks, kept as long as the run's entry so that callers
+        # queued behind a load and later ones share the same lock
+        self._run_locks: dict[int, threading.Lock] = {}
+
+    def get(self, w: WorkspaceClient, run_id: int) -> RunDetail:
+        """
+        Return the details of a run, loading them on a miss; concurrent
+        misses for the same run share one load
+        """
+        detail = self._lookup(run_id)
+        if detail is not None:
+            metrics.cache_lookup("run_details", hit=True)
+            return detail
+        with self._lock:
+            run_lock = self._run_locks.setdefault(run_id, threading.Lock())
+        with run_lock:
+            detail = self._lookup(run_id)
+            if detail is not None:
+                metrics.cache_lookup("run_details", hit=True)
+                return detail
+            metrics.cache_lookup("run_details", hit=False)
+            try:
+                detail = load_run_detail(w, run_id)
+            except Exception:
+                # Nothing is cached for the run, so nothing would drop its lock later
+                with self._lock:
+                    if run_id not in self._entries:
+                        self._run_locks.pop(run_id, None)
+                raise
+            self._put(detail)
+        return detail
+
+    def _lookup(self, run_id: int):
+        with self._lock:
+            detail = self._entries.get(run_id)
+            if detail is None:
+                return None
+            if not detail.terminal and time.time() - detail.fetched_at > self._active_ttl:
+                return None
+            self._entries.move_to_end(run_id)
+            return detail
+
+    def _put(self, detail: RunDetail):
+        with self._lock:
+            old = self._entries.pop(detail.run_id, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[detail.run_id] = detail
+            self._bytes += detail.size
+            while self._bytes > self._max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._run_locks.pop(evicted.run_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self._max_bytes}
+
+
+_cache = RunDetailsCache()
+
+
+def get_run_details_cache() -> RunDetailsCache:
+    """
+    Return the process-wide run details cache
+    """
+    return _cache
@@ -0,0 +1,149 @@
+"""
+Streaming export of a job's run history to CSV or Parquet.
+
+Runs are paged from the Jobs API, normalized a chunk at a time and appended
+to a file on local disk (CSV rows, or one Parquet row group per chunk), so
+memory stays flat however many runs a job has. Exports stop at
+EXPORT_MAX_BYTES, as the download itself is served from memory. The caller
+iterates the export to report progress; the finished file is then offered
+for download.
+"""
+import json
+import os
+import tempfile
+import time
+from itertools import islice
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from databricks.sdk import WorkspaceClient
+from instrumentation import metrics
+from run_normalizer import extract_runs, runs_frame
+from run_store import RUNS_PAGE_SIZE
+
+EXPORT_DIR = os.environ.get("RUN_EXPORT_DIR", os.path.join(tempfile.gettempdir(), "trigger_job_app", "exports"))
+# Runs normalized and written per chunk
+EXPORT_CHUNK_RUNS = 1000
+# Export files older than this are removed when a new export starts
+EXPORT_RETENTION_SECONDS = 3600
+# Exports stop once the file reaches this size; a download is held in memory while it is served
+EXPORT_MAX_BYTES = int(float(os.environ.get("RUN_EXPORT_MAX_MB", "256")) * 1024 * 1024)
+FORMATS = {"CSV": ("csv", "text/csv"), "Parquet": ("parquet", "application/vnd.apache.parquet")}
+
+# Parquet schema of an export; CSV uses the same columns
+EXPORT_SCHEMA = pa.schema([
+    ("run_id", pa.int64()),
+    ("job_id", pa.int64()),
+    ("start_time", pa.timestamp("ms")),
+    ("end_time", pa.timestamp("ms")),
+    ("duration_s", pa.int64()),
+    ("queue_s", pa.int64()),
+    ("status", pa.string()),
+    ("error_code", pa.string()),
+    ("triggered_by", pa.string()),
+    ("parameters", pa.string()),
+])
+
+
+def _triggered_by(params) -> str:
+    for name, value in params:
+        if name == "triggered_by":
+            return value
+        if not name and value.startswith("--triggered_by="):
+            return value.split("=", 1)[1]
+    return ""
+
+
+def export_frame(cols: dict[str, list]) -> pd.DataFrame:
+    """
+    Export rows for one chunk of raw columns: local timestamps, seconds,
+    triggered_by provenance and all parameters as a JSON object/list
+    """
+    df = runs_frame(cols)
+    return pd.DataFrame({
+        "run_id": df["run_id"],
+        "job_id": df["job_id"],
+        "start_time": df["start_time"],
+        "end_time": df["end_time"],
+        "duration_s": df["duration_s"],
+        "queue_s": df["queue_s"],
+        "status": df["status"].astype("string"),
+        "error_code": df["error_code"],
+        "triggered_by": pd.array([_triggered_by(p) for p in cols["parameters"]], dtype="string"),
+        "parameters": pd.array(
+            [json.dumps(dict(p) if all(name for name, _ in p) else [v for _, v in p]) for p in cols["parameters"]],
+            dtype="string",
+        ),
+    })
+
+
+def cleanup_exports(now: float | None = None):
+    """
+    Remove export files older than EXPORT_RETENTION_SECONDS
+    """
+    now = now or time.time()
+    try:
+        names = os.listdir(EXPORT_DIR)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(EXPORT_DIR, name)
+        try:
+            if now - os.path.getmtime(path) > EXPORT_RETENTION_SECONDS:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def new_export_path(job_id: int, fmt: str) -> str:
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix=f"runs_{job_id}_", suffix=f".{FORMATS[fmt][0]}", dir=EXPORT_DIR)
+    os.close(fd)
+    return path
+
+
+def export_runs(w: WorkspaceClient, job_id: int, path: str, fmt: str = "CSV",
+                start_time_from: int | None = None, start_time_to: int | None = None):
+    """
+    Page through the runs of a job (newest first, optionally within a start
+    time window in epoch ms) and write them to `path`, stopping once the file
+    reaches EXPORT_MAX_BYTES. A generator: yields (runs written so far, start
+    time of the oldest run written) after every chunk.
+    """
+    runs = iter(w.jobs.list_runs(
+        job_id=job_id, start_time_from=start_time_from, start_time_to=start_time_to, limit=RUNS_PAGE_SIZE,
+    ))
+    written = 0
+    writer = None
+    try:
+        with open(path, "wb") as f:
+            while True:
+                chunk = list(islice(runs, EXPORT_CHUNK_RUNS))
+                if not chunk:
+                    break
+                with metrics.timer("run_export.write_chunk"):
+                    cols = extract_runs(chunk)
+                    del chunk
+                    df = export_frame(cols)
+                    if fmt == "Parquet":
+                        if writer is None:
+                            writer = pq.ParquetWriter(f, EXPORT_SCHEMA, compression="zstd")
+                        writer.write_table(pa.Table.from_pandas(df, schema=EXPORT_SCHEMA, preserve_index=False))
+                    else:
+                        df.to_csv(f, header=written == 0, index=False, date_format="%Y-%m-%d %H:%M:%S")
+                written += len(df)
+                yield written, min((t for t in cols["start_time"] if t), default=0)
+                if f.tell() >= EXPORT_MAX_BYTES:
+                    break
+            if fmt == "Parquet" and writer is None:
+                # Still produce a readable file with the right columns
+                writer = pq.ParquetWriter(f, EXPORT_SCHEMA, compression="zstd")
+            elif fmt == "CSV" and written == 0:
+                f.write((",".join(EXPORT_SCHEMA.names) + "\n").encode("utf-8"))
+            if writer is not None:
+                writer.close()
+                writer = None
+    finally:
+        if writer is not None:
+            writer.close()
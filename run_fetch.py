@@ -0,0 +1,85 @@
+"""
+Run history fetching helpers for the Jobs API
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+
+from databricks.sdk import WorkspaceClient
+from run_normalizer import extract_runs
+
+MAX_WORKERS = int(os.environ.get("RUN_FETCH_MAX_WORKERS", "8"))
+PER_JOB_TIMEOUT_SECONDS = float(os.environ.get("RUN_FETCH_TIMEOUT_SECONDS", "20"))
+# How often the collector wakes up to check for timed-out jobs
+_POLL_INTERVAL_SECONDS = 0.2
+
+
+@dataclass(slots=True)
+class JobRunsResult:
+    """
+    Outcome of fetching the latest runs of one job; runs are reduced to raw
+    columns (see run_normalizer.extract_runs) as soon as they arrive
+    """
+    job_id: int
+    runs: dict = field(default_factory=dict)
+    error: str = ""
+    elapsed: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.runs.get("run_id", ()))
+
+
+def list_latest_runs(w: WorkspaceClient, job_id: int, limit: int = 5, offset: int = 0) -> list:
+    """
+    Return at most `limit` runs of a job, newest first.
+    The SDK iterator follows page tokens forever, so stop after one page.
+    """
+    return list(islice(w.jobs.list_runs(job_id=job_id, limit=limit, offset=offset or None), limit))
+
+
+def fetch_runs_concurrently(
+    w: WorkspaceClient,
+    job_ids,
+    limit: int = 5,
+    max_workers: int = MAX_WORKERS,
+    timeout: float = PER_JOB_TIMEOUT_SECONDS,
+):
+    """
+    Fetch the latest runs of many jobs through a bounded thread pool.
+
+    Yields one JobRunsResult per job in completion order, so callers can
+    render partial results. A job whose request has been running for longer
+    than `timeout` seconds is reported as timed out and no longer waited for.
+    """
+    started: dict[int, float] = {}
+
+    def fetch(job_id):
+        started[job_id] = time.monotonic()
+        # Drop the SDK objects (tasks, cluster specs, ...) in the worker; only displayed fields are kept
+        return extract_runs(list_latest_runs(w, job_id, limit=limit))
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="run-fetch")
+    futures = {pool.submit(fetch, job_id): job_id for job_id in job_ids}
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=_POLL_INTERVAL_SECONDS, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in done:
+                job_id = futures[future]
+                elapsed = now - started.get(job_id, now)
+                try:
+                    yield JobRunsResult(job_id=job_id, runs=future.result(), elapsed=elapsed)
+                except Exception as e:
+                    yield JobRunsResult(job_id=job_id, error=str(e), elapsed=elapsed)
+            for future in list(pending):
+                job_id = futures[future]
+                if job_id in started and now - started[job_id] > timeout:
+                    pending.discard(future)
+                    yield JobRunsResult(job_id=job_id, error=f"Timed out after {timeout:.0f}s", elapsed=now - started[job_id])
+    finally:
+        # Don't block the page on stragglers; queued work is dropped
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,171 @@
+"""
+Run history filters pushed down to the Jobs API.
+
+runs/list filters by active or completed runs, start time window and run
+type, so those are sent with the request and only runs that pass them are
+paged in. The outcome of a finished run (succeeded, failed, canceled) is not
+an API filter; it is applied to each page as it arrives, and paging stops
+once enough runs match. Outcomes follow the Statistics view (see
+run_normalizer.run_outcome): a finished run failed unless it succeeded or
+was canceled. Results are cached per filter
+for a few seconds, as the run table is rerendered often.
+"""
+import datetime
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+
+from databricks.sdk import WorkspaceClient
+from databricks.sdk.service.jobs import RunType
+from instrumentation import metrics, timed
+from run_normalizer import OUTCOMES, RAW_COLUMNS, extract_runs, run_outcome
+from run_store import RUNS_PAGE_SIZE
+
+FINISHED_OUTCOMES = frozenset(OUTCOMES[:3])
+RUN_TYPES = tuple(t.value for t in RunType)
+# Seconds a filtered result is reused before the API is asked again
+FILTER_TTL_SECONDS = int(os.environ.get("RUN_FILTER_TTL_SECONDS", "15"))
+# Most runs paged in per query while looking for runs with the wanted outcome
+MAX_SCANNED_RUNS = int(os.environ.get("RUN_FILTER_MAX_SCANNED_RUNS", "2000"))
+# Filtered results kept in memory
+MAX_CACHED_RESULTS = 64
+
+
+def day_range_ms(first: datetime.date, last: datetime.date) -> tuple[int, int]:
+    """
+    Epoch ms bounds of the local days from `first` to `last`, inclusive
+    """
+    start = int(time.mktime(first.timetuple()) * 1000)
+    end = int(time.mktime((last + datetime.timedelta(days=1)).timetuple()) * 1000) - 1
+    return start, end
+
+
+@dataclass(frozen=True, slots=True)
+class RunFilter:
+    """
+    Filter over the runs of a job; empty fields match everything
+    """
+    outcomes: tuple = ()
+    start_time_from: int | None = None
+    start_time_to: int | None = None
+    run_type: str = ""
+
+    @property
+    def active(self) -> bool:
+        return bool(self.outcomes or self.start_time_from or self.start_time_to or self.run_type)
+
+    @property
+    def outcome_filter(self) -> frozenset:
+        """
+        Outcomes to check client-side; empty when the API filter is exact
+        """
+        outcomes = frozenset(self.outcomes)
+        if not outcomes or outcomes == {"In progress"} or outcomes == FINISHED_OUTCOMES or len(outcomes) == len(OUTCOMES):
+            return frozenset()
+        return outcomes
+
+    def api_params(self) -> dict:
+        """
+        Keyword arguments of jobs.list_runs for the parts the API can filter
+        """
+        params = {}
+        outcomes = frozenset(self.outcomes)
+        if outcomes == {"In progress"}:
+            params["active_only"] = True
+        elif outcomes and "In progress" not in outcomes:
+            params["completed_only"] = True
+        if self.start_time_from:
+            params["start_time_from"] = self.start_time_from
+        if self.start_time_to:
+            params["start_time_to"] = self.start_time_to
+        if self.run_type:
+            params["run_type"] = RunType(self.run_type)
+        return params
+
+
+@dataclass(frozen=True, slots=True)
+class FilteredRuns:
+    """
+    Runs of a job matching a filter, newest first, as raw columns
+    """
+    cols: dict
+    # Runs paged in from the API to find them
+    scanned: int
+    # Every run passing the API filters was scanned
+    complete: bool
+    fetched_at: float
+
+
+@timed("run_filters.fetch")
+def fetch_filtered_runs(w: WorkspaceClient, job_id: int, run_filter: RunFilter, limit: int) -> FilteredRuns:
+    """
+    Page through the runs passing the API-side filters until `limit` runs
+    match the client-side ones, the list ends, or MAX_SCANNED_RUNS were read
+    """
+    runs = iter(w.jobs.list_runs(job_id=job_id, limit=RUNS_PAGE_SIZE, **run_filter.api_params()))
+    outcomes = run_filter.outcome_filter
+    cols = {name: [] for name in RAW_COLUMNS}
+    scanned, complete = 0, False
+    while len(cols["run_id"]) < limit:
+        if scanned >= MAX_SCANNED_RUNS:
+            break
+        chunk = list(islice(runs, RUNS_PAGE_SIZE))
+        if not chunk:
+            complete = True
+            break
+        scanned += len(chunk)
+        page = extract_runs(chunk)
+        if outcomes:
+            keep = [run_outcome(s, c, e) in outcomes
+                    for s, c, e in zip(page["status"], page["error_code"], page["end_time"])]
+            for name in RAW_COLUMNS:
+                cols[name].extend(v for v, k in zip(page[name], keep) if k)
+        else:
+            for name in RAW_COLUMNS:
+                cols[name].extend(page[name])
+    if len(cols["run_id"]) > limit:
+        cols = {name: values[:limit] for name, values in cols.items()}
+    return FilteredRuns(cols=cols, scanned=scanned, complete=complete, fetched_at=time.time())
+
+
+class FilteredRunsCache:
+    """
+    Thread-safe LRU of filtered results with a short TTL
+    """
+
+    def __init__(self, ttl: float = FILTER_TTL_SECONDS, max_entries: int = MAX_CACHED_RESULTS):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, FilteredRuns] = OrderedDict()
+
+    def get(self, w: WorkspaceClient, job_id: int, run_filter: RunFilter, limit: int,
+            force: bool = False) -> FilteredRuns:
+        key = (job_id, run_filter, limit)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None and not force and time.time() - result.fetched_at <= self._ttl:
+                self._entries.move_to_end(key)
+                metrics.cache_lookup("run_filters", hit=True)
+                return result
+        metrics.cache_lookup("run_filters", hit=False)
+        result = fetch_filtered_runs(w, job_id, run_filter, limit)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+
+_cache = FilteredRunsCache()
+
+
+def get_filtered_runs_cache() -> FilteredRunsCache:
+    """
+    Return the process-wide filtered runs cache
+    """
+    return _cache
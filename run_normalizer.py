@@ -0,0 +1,330 @@
+"""
+Columnar normalization of Jobs API runs.
+
+Turns a batch of SDK run objects into a pandas DataFrame in a single pass.
+Field extraction is a flat loop over plain attributes; status resolution is
+table-driven and memoized; timestamps and durations are converted on whole
+columns at once. Has no Streamlit dependency.
+"""
+import datetime
+import os
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+import pandas as pd
+from dateutil import tz
+from instrumentation import timed
+
+# Raw columns produced by extract_runs, in order
+RAW_COLUMNS = (
+    "run_id",
+    "job_id",
+    "start_time",
+    "end_time",
+    "execution_duration",
+    "queue_duration",
+    "status",
+    "error_code",
+    "parameters",
+)
+
+# Column names of the table shown in the UI
+DISPLAY_COLUMNS = ("Start time", "Run ID", "Launched", "Duration", "Status", "Error code", "Run parameters")
+
+# Result/termination codes that replace the life-cycle state as the displayed status
+RESULT_STATUSES = frozenset({"SUCCESS", "FAILED", "CANCELED", "TIMEDOUT"})
+# Run states (v2 `status.state`) for which termination details are meaningful
+TERMINAL_STATES = frozenset({"TERMINATING", "TERMINATED"})
+# Statuses for which the state message is not treated as an error
+HEALTHY_STATUSES = frozenset({"SUCCESS", "RUNNING", "PENDING"})
+
+# Outcomes of a run, as filtered on and counted by the Statistics view
+OUTCOMES = ("Succeeded", "Failed", "Canceled", "In progress")
+# Statuses or error codes (v2 termination codes and legacy result states) of a
+# finished run that count as succeeded or canceled; any other finished run failed
+SUCCEEDED_CODES = frozenset({"SUCCESS", "SUCCESS_WITH_FAILURES"})
+CANCELED_CODES = frozenset({"CANCELED", "USER_CANCELED", "SKIPPED", "EXCLUDED", "UPSTREAM_CANCELED"})
+
+# Where the error code comes from when it is a free-text message
+_MSG_NONE, _MSG_TERMINATION, _MSG_STATE = 0, 1, 2
+
+# Parameter sources read from `overriding_parameters` when a run has no
+# `job_parameters`, in display order: (field, is_map)
+OVERRIDE_PARAM_FIELDS = (
+    ("job_parameters", True),
+    ("notebook_params", True),
+    ("python_named_params", True),
+    ("python_params", False),
+)
+
+
+def _local_zone() -> datetime.tzinfo:
+    """
+    The local time zone with its DST rules: the IANA zone named by TZ or
+    /etc/localtime, which pandas converts in bulk, else dateutil's tzlocal()
+    """
+    name = os.environ.get("TZ", "").lstrip(":")
+    if not name:
+        try:
+            name = os.path.realpath("/etc/localtime").split("/zoneinfo/", 1)[1]
+        except (IndexError, OSError):
+            name = ""
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return tz.tzlocal()
+
+
+_LOCAL_TZ = _local_zone()
+
+
+def _enum_str(value) -> str:
+    if value is None:
+        return ""
+    return str(getattr(value, "value", value))
+
+
+def _enum_key(value):
+    # Enum hashing goes through a Python-level __hash__; the raw value hashes in C
+    return getattr(value, "_value_", value)
+
+
+@lru_cache(maxsize=1024)
+def resolve_status(state, code, has_term_message: bool, life_cycle, result, has_state_message: bool):
+    """
+    Map the raw state fields of a run to (status, error_code, message_source).
+
+    Accepts SDK enums or strings. `message_source` tells the caller which
+    free-text message, if any, to use as the error code; messages are kept out
+    of the key so the cache stays small and hits on almost every run.
+    """
+    state, code, life_cycle, result = (_enum_str(v) for v in (state, code, life_cycle, result))
+    status, error_code, message = "Unknown", "", _MSG_NONE
+
+    # Prefer the v2 status block
+    if state:
+        status = state
+        if state in TERMINAL_STATES:
+            if code:
+                if code in RESULT_STATUSES:
+                    status = code
+                    error_code = "" if code == "SUCCESS" else code
+                else:
+                    error_code = code
+            elif has_term_message:
+                message = _MSG_TERMINATION
+
+    # Fall back to the legacy life-cycle state
+    if status == "Unknown" and (life_cycle or result or has_state_message):
+        if life_cycle:
+            status = life_cycle
+            if status == "TERMINATED" and result in RESULT_STATUSES:
+                status = result
+                error_code = "" if result == "SUCCESS" else result
+            elif status == "TERMINATED" and result:
+                error_code = result
+        if not error_code and status not in HEALTHY_STATUSES and has_state_message:
+            message = _MSG_STATE
+
+    return status, error_code, message
+
+
+@lru_cache(maxsize=1024)
+def finished_outcome(status: str, error_code: str) -> str:
+    """
+    Outcome of a finished run from its displayed status and error code (see
+    run_status): a v2 run keeps the TERMINATED status and carries its
+    termination code, e.g. USER_CANCELED, as the error code
+    """
+    if status in SUCCEEDED_CODES or error_code in SUCCEEDED_CODES:
+        return "Succeeded"
+    if status in CANCELED_CODES or error_code in CANCELED_CODES:
+        return "Canceled"
+    return "Failed"
+
+
+def run_outcome(status: str, error_code: str, end_time: int) -> str:
+    """
+    One of OUTCOMES for a run; it is in progress until it has an end time
+    """
+    if not end_time:
+        return "In progress"
+    return finished_outcome(status, error_code)
+
+
+def _extract_parameters(run) -> list:
+    """
+    Return run parameters as (name, value) pairs; positional values have an empty name
+    """
+    job_parameters = run.job_parameters
+    if job_parameters:
+        if isinstance(job_parameters, dict):
+            return [(str(k), str(v)) for k, v in job_parameters.items()]
+        if not isinstance(job_parameters, list):
+            return [("", str(job_parameters))]
+        params = []
+        for p in job_parameters:
+            if isinstance(p, dict):
+                if "name" in p and "value" in p:
+                    params.append((str(p["name"]), str(p["value"])))
+                else:
+                    params.extend((str(k), str(v)) for k, v in p.items())
+            elif hasattr(p, "name"):
+                params.append((p.name, "" if p.value is None else p.value))
+            else:
+                params.append(("", str(p)))
+        return params
+
+    overriding = run.overriding_parameters
+    if not overriding:
+        return []
+    params = []
+    for field, is_map in OVERRIDE_PARAM_FIELDS:
+        values = getattr(overriding, field, None)
+        if not values:
+            continue
+        if is_map:
+            params.extend((str(k), str(v)) for k, v in values.items())
+        else:
+            params.extend(("", str(v)) for v in values)
+    return params
+
+
+def format_parameters(params) -> str:
+    if not params:
+        return "None"
+    return ", ".join(f"{name}: {value}" if name else value for name, value in params)
+
+
+def run_status(run) -> tuple[str, str]:
+    """
+    Resolve the displayed (status, error_code) of a run or task run
+    """
+    v2, legacy = run.status, run.state
+    details = v2.termination_details if v2 else None
+    term_message = details.message if details else None
+    state_message = legacy.state_message if legacy else None
+    status, error_code, message = resolve_status(
+        _enum_key(v2.state) if v2 else None,
+        _enum_key(details.code) if details else None,
+        bool(term_message),
+        _enum_key(legacy.life_cycle_state) if legacy else None,
+        _enum_key(legacy.result_state) if legacy else None,
+        bool(state_message),
+    )
+    if message == _MSG_TERMINATION:
+        error_code = str(term_message)
+    elif message == _MSG_STATE:
+        error_code = str(state_message)
+    return status, error_code
+
+
+@timed("run_normalizer.extract_runs")
+def extract_runs(runs) -> dict[str, list]:
+    """
+    Pull the raw fields of every SDK run into column lists (see RAW_COLUMNS).
+    Values are plain ints, strings and (name, value) pairs; missing
+    timestamps and durations are 0.
+    """
+    cols = {name: [] for name in RAW_COLUMNS}
+    run_id, job_id = cols["run_id"].append, cols["job_id"].append
+    start, end = cols["start_time"].append, cols["end_time"].append
+    execution, queue = cols["execution_duration"].append, cols["queue_duration"].append
+    status_col, error_col, params_col = cols["status"].append, cols["error_code"].append, cols["parameters"].append
+
+    for run in runs:
+        run_id(run.run_id)
+        job_id(run.job_id)
+        start(run.start_time or 0)
+        end(run.end_time or 0)
+        execution(run.execution_duration or 0)
+        queue(run.queue_duration or 0)
+
+        status, error_code = run_status(run)
+        status_col(status)
+        error_col(error_code)
+        params_col(_extract_parameters(run))
+
+    return cols
+
+
+def _millis(values) -> np.ndarray:
+    """
+    Epoch-millisecond column as floats, with 0/None mapped to NaN
+    """
+    arr = np.array([v or 0 for v in values] if None in values else values, dtype="float64")
+    arr[arr <= 0] = np.nan
+    return arr
+
+
+def to_local_datetime(ms) -> pd.Series:
+    """
+    Convert epoch milliseconds to naive local datetimes, vectorized
+    """
+    return pd.Series(pd.to_datetime(ms, unit="ms", utc=True).tz_convert(_LOCAL_TZ).tz_localize(None))
+
+
+def _seconds(ms: np.ndarray) -> pd.arrays.IntegerArray:
+    return pd.array(np.floor_divide(ms, 1000), dtype="Int64")
+
+
+@timed("run_normalizer.runs_frame")
+def runs_frame(cols: dict[str, list]) -> pd.DataFrame:
+    """
+    Build a typed DataFrame from raw columns: datetimes for start/end,
+    seconds for durations (execution time, else wall time) and queue time.
+    """
+    start = _millis(cols["start_time"])
+    end = _millis(cols["end_time"])
+    execution = _millis(cols["execution_duration"])
+    duration_ms = np.where(np.isnan(execution), end - start, execution)
+
+    return pd.DataFrame({
+        "run_id": pd.array(cols["run_id"], dtype="Int64"),
+        "job_id": pd.array(cols["job_id"], dtype="Int64"),
+        "start_time": to_local_datetime(start),
+        "end_time": to_local_datetime(end),
+        "duration_s": _seconds(duration_ms),
+        "queue_s": _seconds(_millis(cols["queue_duration"])),
+        "status": pd.Categorical(cols["status"]),
+        "error_code": pd.array(cols["error_code"], dtype="string"),
+        "parameters": pd.Series(cols["parameters"], dtype="object"),
+    })
+
+
+def normalize_runs(runs) -> pd.DataFrame:
+    """
+    Turn a batch of SDK run objects into a typed, columnar DataFrame
+    """
+    return runs_frame(extract_runs(runs))
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a normalized frame for keeping in session state: parameters
+    pre-formatted as text and status as a categorical
+    """
+    return df.assign(
+        status=df["status"].astype("category"),
+        parameters=pd.Series([format_parameters(p) for p in df["parameters"]], index=df.index, dtype="string"),
+    )
+
+
+@timed("run_normalizer.display_frame")
+def display_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Format a normalized (or compacted) frame into the run table shown in the UI
+    """
+    duration = df["duration_s"].astype("string") + "s"
+    return pd.DataFrame({
+        "Start time": df["start_time"].dt.strftime("%Y-%m-%d %H:%M:%S").fillna(""),
+        "Run ID": df["run_id"],
+        "Launched": "Manually",  # Most runs will be manual
+        "Duration": duration.fillna(""),
+        "Status": df["status"].astype("string"),
+        "Error code": df["error_code"].fillna(""),
+        "Run parameters": [p if isinstance(p, str) else format_parameters(p) for p in df["parameters"]],
+    }, index=df.index)
@@ -0,0 +1,122 @@
+"""
+Parsing and validation of whole run-now parameter sets.
+
+The bulk parameter editor works on a job's parameters as (name, value) rows,
+from one grid or one pasted JSON / YAML document, instead of a row of
+widgets per parameter. A set is turned into its run-now shape and checked
+in a single pass: names, the triggered_by email and ASCII-only values.
+List styles use rows with an empty name.
+"""
+import json
+
+import yaml
+from utils import LIST_PARAM_STYLES, MAP_PARAM_STYLES, validate_triggered_by
+
+# Parameter styles the Jobs API only accepts as ASCII
+ASCII_PARAM_STYLES = ("python_params", "spark_submit_params")
+# Parameter sets of at least this many entries open in the bulk editor by default
+BULK_EDITOR_THRESHOLD = 20
+# Errors reported per parameter set; the rest are counted
+MAX_REPORTED_ERRORS = 10
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def params_to_rows(param_style: str, params) -> list[tuple[str, str]]:
+    """
+    Rows of a parameter set in run-now shape (a map or a list)
+    """
+    if param_style in MAP_PARAM_STYLES:
+        return [(str(name), _text(value)) for name, value in (params or {}).items()]
+    return [("", _text(value)) for value in params or []]
+
+
+def parse_params_text(param_style: str, text: str) -> list[tuple[str, str]]:
+    """
+    Parse a pasted parameter set into rows: a JSON or YAML mapping for map
+    styles (a list of {"name": ..., "value": ...} objects is also accepted,
+    as exported from job settings), a JSON or YAML list for list styles
+    """
+    text = text.strip()
+    if not text:
+        return []
+    try:
+        # YAML is a superset of JSON, but JSON errors read better
+        data = json.loads(text) if text[0] in "{[" else yaml.safe_load(text)
+    except (json.JSONDecodeError, yaml.YAMLError) as e:
+        raise ValueError(f"Could not parse parameters: {e}") from None
+
+    if param_style in MAP_PARAM_STYLES:
+        if isinstance(data, list) and all(isinstance(p, dict) and "name" in p for p in data):
+            return [(_text(p["name"]), _text(p.get("value", p.get("default")))) for p in data]
+        if not isinstance(data, dict):
+            raise ValueError(f"{param_style} must be a mapping of parameter name to value")
+        return params_to_rows(param_style, data)
+    if not isinstance(data, list):
+        raise ValueError(f"{param_style} must be a list of values")
+    return params_to_rows(param_style, data)
+
+
+def dump_params(param_style: str, rows, fmt: str = "JSON") -> str:
+    """
+    Serialize rows in run-now shape, for editing as text
+    """
+    if param_style in MAP_PARAM_STYLES:
+        data = {name: value for name, value in rows if name}
+    else:
+        data = [value for _, value in rows if value]
+    if fmt == "YAML":
+        return yaml.safe_dump(data, sort_keys=False, allow_unicode=True)
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def validate_rows(param_style: str, rows) -> tuple[dict | list, list[str]]:
+    """
+    Build the run-now value of a parameter set and collect every problem
+    in one pass: missing or duplicate names, non-ASCII values where the API
+    requires ASCII, and a missing or invalid triggered_by
+    """
+    if param_style not in MAP_PARAM_STYLES and param_style not in LIST_PARAM_STYLES:
+        raise ValueError(f"Unsupported parameter style: {param_style}")
+    is_map = param_style in MAP_PARAM_STYLES
+    ascii_only = param_style in ASCII_PARAM_STYLES
+    params = {} if is_map else []
+    errors = []
+    triggered_by = None
+
+    for index, (name, value) in enumerate(rows, start=1):
+        name = name.strip()
+        if is_map:
+            if not name:
+                if value:
+                    errors.append(f"Row {index}: value '{value[:40]}' has no name")
+                continue
+            if name in params:
+                errors.append(f"Row {index}: '{name}' is set more than once")
+                continue
+            params[name] = value
+            if name == "triggered_by":
+                triggered_by = value
+        else:
+            if not value:
+                continue
+            if ascii_only and not value.isascii():
+                errors.append(f"Item {index}: {param_style} must be ASCII, got '{value[:40]}'")
+            params.append(value)
+            if value.startswith("--triggered_by="):
+                triggered_by = value.split("=", 1)[1]
+
+    error = validate_triggered_by(triggered_by or "")
+    if error:
+        errors.append(error)
+    if len(errors) > MAX_REPORTED_ERRORS:
+        errors = errors[:MAX_REPORTED_ERRORS] + [f"... and {len(errors) - MAX_REPORTED_ERRORS} more"]
+    return params, errors
@@ -0,0 +1,225 @@
+"""
+Per-job reliability and duration statistics.
+
+Runs are aggregated chunk by chunk into fixed-size, mergeable summaries, so
+a window of any length is processed without holding its runs in memory:
+counts per outcome, a failure-code breakdown, and log-bucket quantile
+sketches for duration and queue time. Outcomes and durations follow the run
+table: run_normalizer.run_outcome of the resolved status and error code, and
+execution time when known, else wall time. Summaries of several jobs merge into one.
+"""
+import math
+import os
+from collections import Counter
+
+import numpy as np
+from databricks.sdk import WorkspaceClient
+from instrumentation import timed
+from run_normalizer import finished_outcome
+from run_store import RunStore
+
+# Most runs per job a statistics window will backfill and aggregate
+MAX_STATS_RUNS = int(os.environ.get("RUN_STATS_MAX_RUNS", "50000"))
+# Runs fetched per backfill step while extending the stored history to a window
+BACKFILL_STEP_RUNS = 500
+# Most older runs one statistics request backfills, shared by the selected jobs;
+# longer windows are filled in over further requests ("Load more history")
+BACKFILL_BUDGET_RUNS = int(os.environ.get("RUN_STATS_BACKFILL_RUNS", "1000"))
+# Relative accuracy of the quantile sketches
+SKETCH_ACCURACY = 0.01
+# Columns of the run store the aggregator reads
+STATS_COLUMNS = ("start_time", "end_time", "execution_duration", "queue_duration", "status", "error_code")
+
+# How much of a window prepare_window got into the run store
+WINDOW_COVERED, WINDOW_PARTIAL, WINDOW_CAPPED = "covered", "partial", "capped"
+
+
+class QuantileSketch:
+    """
+    Log-bucket quantile sketch: every estimate is within SKETCH_ACCURACY of
+    the true value, memory grows with the range of values rather than their
+    number, and two sketches merge by adding bucket counts
+    """
+    __slots__ = ("_log_gamma", "_gamma", "bins", "zeros", "count", "total", "max")
+
+    def __init__(self, accuracy: float = SKETCH_ACCURACY):
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, values: np.ndarray):
+        """
+        Add a batch of non-negative values
+        """
+        if not len(values):
+            return
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.max = max(self.max, float(values.max()))
+        positive = values[values > 0]
+        self.zeros += len(values) - len(positive)
+        if len(positive):
+            keys, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype("int64"), return_counts=True)
+            bins = self.bins
+            for key, n in zip(keys.tolist(), counts.tolist()):
+                bins[key] = bins.get(key, 0) + n
+
+    def merge(self, other: "QuantileSketch"):
+        for key, n in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + n
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                # Midpoint of the bucket (gamma^(k-1), gamma^k] in relative terms
+                return min(2 * self._gamma ** key / (self._gamma + 1), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+
+class RunStats:
+    """
+    Mergeable summary of a set of runs
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.active = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.canceled = 0
+        self.failure_codes = Counter()
+        self.duration = QuantileSketch()
+        self.queue = QuantileSketch()
+        self.oldest_start = 0
+
+    def add(self, cols: dict[str, list]):
+        """
+        Fold in one chunk of raw columns (see run_store.iter_runs)
+        """
+        if not cols["start_time"]:
+            return
+        start = np.asarray(cols["start_time"], dtype="float64")
+        end = np.asarray(cols["end_time"], dtype="float64")
+        execution = np.asarray(cols["execution_duration"], dtype="float64")
+        error_codes = cols["error_code"]
+
+        terminal = end > 0
+        outcome = np.full(len(start), "In progress", dtype=object)
+        finished = np.flatnonzero(terminal).tolist()
+        outcome[finished] = [finished_outcome(cols["status"][i], error_codes[i]) for i in finished]
+        succeeded = outcome == "Succeeded"
+        canceled = outcome == "Canceled"
+        failed = outcome == "Failed"
+
+        self.runs += len(start)
+        self.active += int((~terminal).sum())
+        self.succeeded += int(succeeded.sum())
+        self.canceled += int(canceled.sum())
+        self.failed += int(failed.sum())
+        self.failure_codes.update(error_codes[i] or cols["status"][i] for i in np.flatnonzero(failed).tolist())
+
+        duration = np.where(execution > 0, execution, end - start)[terminal]
+        self.duration.add(np.maximum(duration, 0) / 1000)
+        self.queue.add(np.asarray(cols["queue_duration"], dtype="float64") / 1000)
+        oldest = int(start.min())
+        self.oldest_start = min(self.oldest_start, oldest) if self.oldest_start else oldest
+
+    def merge(self, other: "RunStats"):
+        self.runs += other.runs
+        self.active += other.active
+        self.succeeded += other.succeeded
+        self.failed += other.failed
+        self.canceled += other.canceled
+        self.failure_codes.update(other.failure_codes)
+        self.duration.merge(other.duration)
+        self.queue.merge(other.queue)
+        if other.oldest_start:
+            self.oldest_start = min(self.oldest_start, other.oldest_start) if self.oldest_start else other.oldest_start
+
+    @property
+    def finished(self) -> int:
+        return self.succeeded + self.failed + self.canceled
+
+    def rate(self, n: int) -> float | None:
+        return n / self.finished if self.finished else None
+
+    def summary(self) -> dict:
+        """
+        One table row: outcome rates, duration and queue percentiles (seconds)
+        """
+        return {
+            "Runs": self.runs,
+            "Active": self.active,
+            "Success rate": self.rate(self.succeeded),
+            "Failure rate": self.rate(self.failed),
+            "Canceled rate": self.rate(self.canceled),
+            "p50 duration (s)": self.duration.quantile(0.5),
+            "p95 duration (s)": self.duration.quantile(0.95),
+            "p99 duration (s)": self.duration.quantile(0.99),
+            "Mean queue (s)": self.queue.mean,
+            "p95 queue (s)": self.queue.quantile(0.95),
+            "Top failure codes": ", ".join(f"{code} ({n})" for code, n in self.failure_codes.most_common(3)),
+        }
+
+
+@timed("run_stats.prepare_window")
+def prepare_window(w: WorkspaceClient, store: RunStore, job_id: int, since: int | None = None,
+                   max_runs: int | None = None, budget: int | None = None) -> str:
+    """
+    Sync a job and backfill its stored history until it reaches back to
+    `since` (epoch ms) or holds `max_runs` runs, capped at MAX_STATS_RUNS,
+    fetching at most `budget` older runs (no limit when None).
+    Returns WINDOW_COVERED, WINDOW_PARTIAL if the budget ran out first, or
+    WINDOW_CAPPED if the cap stopped the backfill before the window was covered.
+    """
+    store.sync(w, job_id)
+    wanted = min(max_runs or MAX_STATS_RUNS, MAX_STATS_RUNS)
+    fetched = 0
+    while not store.exhausted(job_id):
+        oldest, _ = store.time_range(job_id)
+        if max_runs is None and oldest is not None and oldest <= (since or 0):
+            return WINDOW_COVERED
+        count = store.count(job_id)
+        if count >= wanted:
+            return WINDOW_COVERED if max_runs is not None and max_runs <= MAX_STATS_RUNS else WINDOW_CAPPED
+        step = min(BACKFILL_STEP_RUNS, wanted - count)
+        if budget is not None:
+            if fetched >= budget:
+                return WINDOW_PARTIAL
+            step = min(step, budget - fetched)
+        saved = store.backfill(w, job_id, step)
+        if not saved:
+            break
+        fetched += saved
+    return WINDOW_COVERED
+
+
+@timed("run_stats.job_stats")
+def job_stats(store: RunStore, job_id: int, since: int | None = None, max_runs: int | None = None) -> RunStats:
+    """
+    Aggregate the stored runs of a job within a window, one chunk at a time
+    """
+    stats = RunStats()
+    limit = min(max_runs or MAX_STATS_RUNS, MAX_STATS_RUNS)
+    for cols in store.iter_runs(job_id, since=since, limit=limit, columns=STATS_COLUMNS):
+        stats.add(cols)
+    return stats
@@ -0,0 +1,348 @@
+"""
+Local SQLite store of job runs.
+
+Runs are synced incrementally from the Jobs API: only runs newer than the
+newest stored one (plus any stored runs that were still active) are fetched,
+following the API's page tokens. History browsing is then a local query on
+(job_id, start_time). Only sync and backfill insert runs, so the stored range
+for a job is always contiguous from its newest run backwards. Each write
+also updates the inverted index over run parameters (see param_index), which
+serves provenance searches across all stored jobs.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from databricks.sdk import WorkspaceClient
+from instrumentation import metrics, timed
+from param_index import ParamTerm, index_terms
+from run_normalizer import RAW_COLUMNS, extract_runs
+
+RUN_STORE_PATH = os.environ.get(
+    "RUN_STORE_PATH",
+    os.path.join(tempfile.gettempdir(), "trigger_job_app", "runs.sqlite3"),
+)
+# Minimum seconds between two syncs of the same job
+SYNC_INTERVAL_SECONDS = int(os.environ.get("RUN_STORE_SYNC_INTERVAL_SECONDS", "15"))
+# Runs fetched the first time a job is synced; older ones are backfilled on demand
+INITIAL_SYNC_RUNS = int(os.environ.get("RUN_STORE_INITIAL_RUNS", "100"))
+# Largest page size accepted by the runs list endpoint
+RUNS_PAGE_SIZE = 25
+# Schema version (PRAGMA user_version); stores of an older version are migrated on open
+SCHEMA_VERSION = 1
+# Runs read per step while indexing the parameters of runs stored before the index existed
+REINDEX_CHUNK_RUNS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    job_id INTEGER NOT NULL,
+    start_time INTEGER NOT NULL,
+    end_time INTEGER NOT NULL,
+    execution_duration INTEGER NOT NULL,
+    queue_duration INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    error_code TEXT NOT NULL,
+    parameters TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_job_start ON runs (job_id, start_time DESC, run_id DESC);
+CREATE TABLE IF NOT EXISTS sync_state (
+    job_id INTEGER PRIMARY KEY,
+    synced_at REAL NOT NULL DEFAULT 0,
+    exhausted INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS run_params (
+    name TEXT NOT NULL,
+    value TEXT NOT NULL COLLATE NOCASE,
+    start_time INTEGER NOT NULL,
+    run_id INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
+    PRIMARY KEY (name, value, start_time, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS run_params_value ON run_params (value, start_time);
+CREATE INDEX IF NOT EXISTS run_params_run ON run_params (run_id);
+"""
+
+
+class RunStore:
+    """
+    Thread-safe SQLite run store shared by all sessions of the app
+    """
+
+    def __init__(self, path: str = RUN_STORE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._job_locks: dict[int, threading.Lock] = {}
+        if self._fetchone("PRAGMA user_version")[0] < SCHEMA_VERSION:
+            self._reindex_params()
+
+    # --- Writes ---
+    @contextmanager
+    def _transaction(self):
+        """
+        Hold the store lock for one transaction on the shared connection,
+        rolled back if any statement fails so later writes can still begin
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def upsert(self, cols: dict[str, list]) -> int:
+        """
+        Insert or replace runs given as raw columns (see run_normalizer.extract_runs)
+        """
+        rows = list(zip(
+            cols["run_id"], cols["job_id"], cols["start_time"], cols["end_time"],
+            cols["execution_duration"], cols["queue_duration"], cols["status"], cols["error_code"],
+            (json.dumps(p, separators=(",", ":")) for p in cols["parameters"]),
+        ))
+        if not rows:
+            return 0
+        with self._transaction():
+            self._conn.executemany("INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            # Active runs are written again on later syncs; drop their old postings first
+            self._conn.executemany("DELETE FROM run_params WHERE run_id = ?", ((run_id,) for run_id in cols["run_id"]))
+            self._index_params(cols["run_id"], cols["job_id"], cols["start_time"], cols["parameters"])
+        return len(rows)
+
+    def delete_runs(self, run_ids) -> None:
+        """
+        Remove runs that no longer exist in the workspace
+        """
+        ids = [(run_id,) for run_id in run_ids]
+        with self._transaction():
+            self._conn.executemany("DELETE FROM runs WHERE run_id = ?", ids)
+            self._conn.executemany("DELETE FROM run_params WHERE run_id = ?", ids)
+
+    def _index_params(self, run_ids, job_ids, start_times, parameters):
+        postings = [
+            (name, value, start, run_id, job_id)
+            for run_id, job_id, start, params in zip(run_ids, job_ids, start_times, parameters)
+            for name, value in index_terms(params)
+        ]
+        # Repeated names, or values differing only in case, collapse into one posting
+        self._conn.executemany("INSERT OR IGNORE INTO run_params VALUES (?, ?, ?, ?, ?)", postings)
+
+    @timed("run_store.reindex_params")
+    def _reindex_params(self):
+        """
+        Build the parameter index of every stored run, for stores written
+        before it existed
+        """
+        with self._transaction():
+            self._conn.execute("DELETE FROM run_params")
+            cursor = self._conn.execute("SELECT run_id, job_id, start_time, parameters FROM runs")
+            while rows := cursor.fetchmany(REINDEX_CHUNK_RUNS):
+                run_ids, job_ids, start_times, parameters = zip(*rows)
+                self._index_params(run_ids, job_ids, start_times, [json.loads(p) for p in parameters])
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _save_runs(self, runs) -> int:
+        saved = 0
+        while True:
+            chunk = list(islice(runs, RUNS_PAGE_SIZE * 4))
+            if not chunk:
+                return saved
+            saved += self.upsert(extract_runs(chunk))
+
+    def _set_state(self, job_id: int, **fields):
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO sync_state (job_id) VALUES (?)", (job_id,))
+            for name, value in fields.items():
+                self._conn.execute(f"UPDATE sync_state SET {name} = ? WHERE job_id = ?", (value, job_id))
+
+    # --- Sync with the Jobs API ---
+    def _job_lock(self, job_id: int) -> threading.Lock:
+        with self._lock:
+            return self._job_locks.setdefault(job_id, threading.Lock())
+
+    @timed("run_store.sync")
+    def sync(self, w: WorkspaceClient, job_id: int, force: bool = False, min_interval: float = SYNC_INTERVAL_SECONDS) -> int:
+        """
+        Fetch runs started since the newest stored run (or since the oldest
+        stored run that was still active). Returns the number of runs written.
+        Skipped when the job was synced less than `min_interval` seconds ago.
+        """
+        with self._job_lock(job_id):
+            if not force and time.time() - self.synced_at(job_id) < min_interval:
+                metrics.cache_lookup("run_store.sync", hit=True)
+                return 0
+            metrics.cache_lookup("run_store.sync", hit=False)
+            newest, oldest_active = self._fetchone(
+                "SELECT MAX(start_time), MIN(CASE WHEN end_time = 0 THEN start_time END) FROM runs WHERE job_id = ?",
+                (job_id,),
+            )
+            if newest is None:
+                runs = islice(w.jobs.list_runs(job_id=job_id, limit=RUNS_PAGE_SIZE), INITIAL_SYNC_RUNS)
+            else:
+                since = min(newest, oldest_active) if oldest_active else newest
+                runs = iter(w.jobs.list_runs(job_id=job_id, start_time_from=since, limit=RUNS_PAGE_SIZE))
+            saved = self._save_runs(runs)
+            self._set_state(job_id, synced_at=time.time())
+            return saved
+
+    @timed("run_store.backfill")
+    def backfill(self, w: WorkspaceClient, job_id: int, count: int) -> int:
+        """
+        Fetch up to `count` runs older than the oldest stored run of a job
+        """
+        with self._job_lock(job_id):
+            (oldest,) = self._fetchone("SELECT MIN(start_time) FROM runs WHERE job_id = ?", (job_id,))
+            if oldest is None:
+                runs = islice(w.jobs.list_runs(job_id=job_id, limit=RUNS_PAGE_SIZE), count)
+            else:
+                runs = islice(w.jobs.list_runs(job_id=job_id, start_time_to=oldest - 1, limit=RUNS_PAGE_SIZE), count)
+            saved = self._save_runs(runs)
+            if saved < count:
+                self._set_state(job_id, exhausted=1)
+            return saved
+
+    # --- Reads ---
+    def _fetchone(self, sql: str, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _fetchall(self, sql: str, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def synced_at(self, job_id: int) -> float:
+        row = self._fetchone("SELECT synced_at FROM sync_state WHERE job_id = ?", (job_id,))
+        return row[0] if row else 0.0
+
+    def exhausted(self, job_id: int) -> bool:
+        row = self._fetchone("SELECT exhausted FROM sync_state WHERE job_id = ?", (job_id,))
+        return bool(row and row[0])
+
+    def count(self, job_id: int) -> int:
+        return self._fetchone("SELECT COUNT(*) FROM runs WHERE job_id = ?", (job_id,))[0]
+
+    def active_run_ids(self, job_id: int) -> list[int]:
+        """
+        IDs of stored runs of a job that had not ended when last fetched
+        """
+        rows = self._fetchall("SELECT run_id FROM runs WHERE job_id = ? AND end_time = 0", (job_id,))
+        return [row[0] for row in rows]
+
+    def time_range(self, job_id: int) -> tuple[int | None, int | None]:
+        """
+        (oldest, newest) start time of the stored runs of a job
+        """
+        return tuple(self._fetchone("SELECT MIN(start_time), MAX(start_time) FROM runs WHERE job_id = ?", (job_id,)))
+
+    def iter_runs(self, job_id: int, since: int | None = None, limit: int | None = None,
+                  columns=RAW_COLUMNS, chunk_size: int = 5000):
+        """
+        Yield the stored runs of a job, newest first, as raw column chunks of
+        at most `chunk_size` runs. Only `columns` are read; runs started
+        before `since` (epoch ms) or beyond the first `limit` are skipped.
+        Pages by (start_time, run_id), so the store is not locked between chunks.
+        """
+        names = ", ".join(columns)
+        remaining = limit if limit is not None else float("inf")
+        cursor = None
+        while remaining > 0:
+            size = int(min(chunk_size, remaining))
+            sql = f"SELECT {names}, start_time, run_id FROM runs WHERE job_id = ? AND start_time >= ?"
+            params = [job_id, since or 0]
+            if cursor is not None:
+                sql += " AND (start_time, run_id) < (?, ?)"
+                params += cursor
+            rows = self._fetchall(sql + " ORDER BY start_time DESC, run_id DESC LIMIT ?", (*params, size))
+            if not rows:
+                return
+            cursor = list(rows[-1][-2:])
+            cols = {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+            if "parameters" in cols:
+                cols["parameters"] = [json.loads(p) for p in cols["parameters"]]
+            yield cols
+            remaining -= len(rows)
+            if len(rows) < size:
+                return
+
+    def coverage(self) -> tuple[int, int, int | None]:
+        """
+        (runs, jobs, oldest start time) of the whole store, i.e. what the
+        parameter index covers
+        """
+        return tuple(self._fetchone("SELECT COUNT(*), COUNT(DISTINCT job_id), MIN(start_time) FROM runs"))
+
+    @timed("run_store.search_params")
+    def search_params(self, terms: list[ParamTerm], since: int | None = None, until: int | None = None,
+                      limit: int = 100) -> tuple[dict[str, list], int]:
+        """
+        Stored runs of any job whose parameters match every term, started
+        between `since` and `until` (epoch ms), newest first. Returns the
+        first `limit` runs as raw columns and the number of matching runs.
+        """
+        selects, params = [], []
+        for term in terms:
+            sql = "SELECT run_id FROM run_params WHERE start_time BETWEEN ? AND ?"
+            params += [since or 0, until or 2**62]
+            if term.name:
+                sql += " AND name = ?"
+                params.append(term.name)
+            if term.prefix:
+                if term.value:
+                    # A range on the (NOCASE) value keeps prefix matches on the index
+                    sql += " AND value >= ? AND value < ?"
+                    params += [term.value, term.value + "\U0010ffff"]
+            else:
+                sql += " AND value = ?"
+                params.append(term.value)
+            selects.append(sql)
+        if not selects:
+            return {name: [] for name in RAW_COLUMNS}, 0
+        matches = " INTERSECT ".join(selects)
+        (total,) = self._fetchone(f"SELECT COUNT(*) FROM ({matches})", params)
+        rows = self._fetchall(
+            f"SELECT * FROM runs WHERE run_id IN ({matches}) ORDER BY start_time DESC, run_id DESC LIMIT ?",
+            (*params, limit),
+        )
+        cols = {name: [row[i] for row in rows] for i, name in enumerate(RAW_COLUMNS)}
+        cols["parameters"] = [json.loads(p) for p in cols["parameters"]]
+        return cols, total
+
+    @timed("run_store.query")
+    def query(self, job_id: int, limit: int, offset: int = 0) -> dict[str, list]:
+        """
+        Return the newest stored runs of a job as raw columns, newest first
+        """
+        rows = self._fetchall(
+            "SELECT * FROM runs WHERE job_id = ? ORDER BY start_time DESC, run_id DESC LIMIT ? OFFSET ?",
+            (job_id, limit, offset),
+        )
+        cols = {name: [row[i] for row in rows] for i, name in enumerate(RAW_COLUMNS)}
+        cols["parameters"] = [json.loads(p) for p in cols["parameters"]]
+        return cols
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_run_store() -> RunStore:
+    """
+    Return the process-wide run store, opening it on first use
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RunStore()
+    return _store
@@ -0,0 +1,115 @@
+"""
+Per-session memory accounting and the per-session run cap.
+
+Run tables a session keeps or displays are capped at SESSION_MAX_RUNS rows;
+older rows are evicted as more are loaded. After every render a session
+reports the approximate size of its st.session_state, and the Diagnostics
+page lists the sessions seen recently with their footprint.
+"""
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from types import FunctionType, MethodType, ModuleType
+
+# Most runs a session keeps or displays in one run table
+SESSION_MAX_RUNS = int(os.environ.get("SESSION_MAX_RUNS", "500"))
+# Sessions that have not rendered for this long are dropped from the report
+SESSION_REPORT_TTL_SECONDS = 1800
+# Largest session_state entries listed per session
+TOP_KEYS = 3
+
+_OPAQUE = (type, FunctionType, MethodType, ModuleType)
+
+
+def deep_size(obj, _seen: set | None = None) -> int:
+    """
+    Approximate bytes held by an object and everything it references.
+    DataFrames and arrays report their own (deep) memory usage.
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))) or isinstance(obj, _OPAQUE):
+        return sys.getsizeof(obj)
+    if hasattr(obj, "dtypes") and hasattr(obj, "memory_usage"):
+        # pandas: its own accounting, except object columns, whose values (lists, tuples) are walked
+        if hasattr(obj, "columns"):
+            return int(obj.index.memory_usage(deep=True)) + sum(deep_size(obj[col], seen) for col in obj.columns)
+        if obj.dtype == object:
+            return int(obj.memory_usage(index=False)) + sum(deep_size(value, seen) for value in obj.array)
+        return int(obj.memory_usage(index=False, deep=True))
+    if hasattr(obj, "nbytes") and hasattr(obj, "dtype"):
+        # numpy array: its buffer, counted once for the array that owns it
+        return sys.getsizeof(obj)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    else:
+        if hasattr(obj, "__dict__"):
+            size += deep_size(vars(obj), seen)
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(obj, name):
+                    size += deep_size(getattr(obj, name), seen)
+    return size
+
+
+@dataclass(slots=True)
+class SessionReport:
+    """
+    Memory footprint of one session at its last render
+    """
+    session_id: str
+    page: str
+    updated_at: float
+    bytes: int
+    runs: int
+    # (key, bytes) of the largest session_state entries
+    largest: tuple
+
+
+class SessionMemoryRegistry:
+    """
+    Thread-safe registry of the latest footprint reported by each session
+    """
+
+    def __init__(self, ttl: float = SESSION_REPORT_TTL_SECONDS):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._reports: dict[str, SessionReport] = {}
+
+    def report(self, session_id: str, state: dict, page: str = "", runs: int = 0) -> SessionReport:
+        """
+        Measure a session's state (a plain dict of its entries) and record it
+        """
+        sizes = {str(key): deep_size(value) for key, value in state.items()}
+        largest = tuple(sorted(sizes.items(), key=lambda kv: -kv[1])[:TOP_KEYS])
+        report = SessionReport(session_id, page, time.time(), sum(sizes.values()), runs, largest)
+        with self._lock:
+            self._reports[session_id] = report
+        return report
+
+    def reports(self) -> list[SessionReport]:
+        """
+        Sessions seen within the TTL, largest first
+        """
+        cutoff = time.time() - self._ttl
+        with self._lock:
+            for session_id in [s for s, r in self._reports.items() if r.updated_at < cutoff]:
+                del self._reports[session_id]
+            return sorted(self._reports.values(), key=lambda r: -r.bytes)
+
+
+_registry = SessionMemoryRegistry()
+
+
+def get_session_registry() -> SessionMemoryRegistry:
+    """
+    Return the process-wide session memory registry
+    """
+    return _registry
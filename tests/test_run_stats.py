@@ -0,0 +1,66 @@
+"""
+Outcome counts of RunStats for runs shaped like the Jobs API returns them
+"""
+from databricks.sdk.service.jobs import (
+    BaseRun,
+    RunLifeCycleState,
+    RunLifecycleStateV2State,
+    RunResultState,
+    RunState,
+    RunStatus,
+    TerminationCodeCode,
+    TerminationDetails,
+)
+from run_normalizer import extract_runs, run_outcome
+from run_stats import RunStats
+
+
+def v2_run(run_id: int, code: TerminationCodeCode | None, end_time: int = 2_000) -> BaseRun:
+    state = RunLifecycleStateV2State.TERMINATED if end_time else RunLifecycleStateV2State.RUNNING
+    details = TerminationDetails(code=code) if code else None
+    return BaseRun(run_id=run_id, job_id=1, start_time=1_000, end_time=end_time,
+                   status=RunStatus(state=state, termination_details=details))
+
+
+def legacy_run(run_id: int, result: RunResultState) -> BaseRun:
+    return BaseRun(run_id=run_id, job_id=1, start_time=1_000, end_time=2_000,
+                   state=RunState(life_cycle_state=RunLifeCycleState.TERMINATED, result_state=result))
+
+
+def stats_of(runs) -> RunStats:
+    stats = RunStats()
+    stats.add(extract_runs(runs))
+    return stats
+
+
+def test_v2_termination_codes():
+    stats = stats_of([
+        v2_run(1, TerminationCodeCode.SUCCESS),
+        v2_run(2, TerminationCodeCode.SUCCESS_WITH_FAILURES),
+        v2_run(3, TerminationCodeCode.USER_CANCELED),
+        v2_run(4, TerminationCodeCode.CANCELED),
+        v2_run(5, TerminationCodeCode.SKIPPED),
+        v2_run(6, TerminationCodeCode.RUN_EXECUTION_ERROR),
+        v2_run(7, TerminationCodeCode.CLUSTER_ERROR),
+        v2_run(8, None, end_time=0),
+    ])
+    assert (stats.succeeded, stats.canceled, stats.failed, stats.active) == (2, 3, 2, 1)
+    assert stats.failure_codes == {"RUN_EXECUTION_ERROR": 1, "CLUSTER_ERROR": 1}
+
+
+def test_legacy_result_states():
+    stats = stats_of([
+        legacy_run(1, RunResultState.SUCCESS),
+        legacy_run(2, RunResultState.SUCCESS_WITH_FAILURES),
+        legacy_run(3, RunResultState.CANCELED),
+        legacy_run(4, RunResultState.TIMEDOUT),
+        legacy_run(5, RunResultState.FAILED),
+    ])
+    assert (stats.succeeded, stats.canceled, stats.failed) == (2, 1, 2)
+    assert stats.failure_codes == {"TIMEDOUT": 1, "FAILED": 1}
+
+
+def test_filter_outcomes_match_stats():
+    cols = extract_runs([v2_run(1, TerminationCodeCode.USER_CANCELED), v2_run(2, TerminationCodeCode.SUCCESS_WITH_FAILURES)])
+    outcomes = [run_outcome(*row) for row in zip(cols["status"], cols["error_code"], cols["end_time"])]
+    assert outcomes == ["Canceled", "Succeeded"]
@@ -25,3 +25,52 @@ def job_label(job):
     job_id = getattr(job, "job_id", None)
     name = getattr(job.settings, "name", None) if hasattr(job, "settings") else getattr(job, "name", None)
     return f"{name} (ID {job_id})" if name and job_id else str(job_id or "unknown")
+
+# Parameter styles accepted by run-now, by shape
+MAP_PARAM_STYLES = ("job_parameters", "notebook_params", "python_named_params", "sql_params")
+LIST_PARAM_STYLES = ("python_params", "jar_params", "spark_submit_params", "dbt_commands")
+
+# run-now parameter styles each task type accepts, keyed by the Task field that holds it
+TASK_PARAM_MODES = {
+    "notebook_task": ("notebook_params",),
+    # Python script tasks take python_params (list) or python_named_params (map)
+    "spark_python_task": ("python_params", "python_named_params"),
+    "spark_jar_task": ("jar_params",),
+    "spark_submit_task": ("spark_submit_params",),
+    "sql_task": ("sql_params",),
+    "python_wheel_task": ("python_named_params",),
+    "dbt_task": ("dbt_commands",),
+}
+
+def detect_param_modes(tasks):
+    """
+    Return the set of task-specific parameter styles accepted by a job's tasks
+    """
+    modes = set()
+    for task in tasks or []:
+        for field, styles in TASK_PARAM_MODES.items():
+            if getattr(task, field, None) is not None:
+                modes.update(styles)
+    return modes
+
+def extract_triggered_by(param_style, params):
+    """
+    Return the triggered_by value from a map of params or from a
+    '--triggered_by=<email>' item in a list of params ("" if missing)
+    """
+    if param_style in MAP_PARAM_STYLES:
+        return (params or {}).get("triggered_by", "")
+    for param in params or []:
+        if param.startswith("--triggered_by="):
+            return param.split("=", 1)[1]
+    return ""
+
+def validate_triggered_by(value):
+    """
+    Return an error message if value is not a plausible email address, else None
+    """
+    if not value or not value.strip():
+        return "Please fill in the 'triggered_by' parameter with a valid email address"
+    if "@" not in value or "." not in value.split("@")[-1]:
+        return "Please provide a valid email address in the 'triggered_by' parameter"
+    return None